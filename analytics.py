@@ -0,0 +1,111 @@
+# Progress graph for the Pi Memory Game
+# matplotlib is heavy (a good chunk of a second to import), so pi_game only imports this module the
+# first time someone opens the graph.
+
+from datetime import datetime
+
+import matplotlib.dates as mdates
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+from matplotlib.figure import Figure
+
+
+# Progress graph embedded in the game window
+# The figure and its line artists are created once and kept alive between visits - every redraw just swaps the
+# data on the existing artists. Only the visible date range is queried from the score database: up to 120 days
+# shows every day, longer ranges come back from SQL as weekly or monthly rollups (a min/max band with the mean
+# on top), and the little score labels only appear when you zoom in far enough.
+class ProgressGraph:
+    DAILY_LIMIT = 120  # most days on screen before switching to weekly rollups
+    WEEKLY_LIMIT = 730  # most days on screen before switching to monthly rollups
+    LABEL_LIMIT = 31  # most points on screen that still get a score label
+
+    def __init__(self, parent, scores):
+        self.scores = scores
+        self.band = None
+        self.labels = []
+        self._updating = False
+        # julianday() from SQLite minus this gives a matplotlib date number
+        self.jd_offset = 2440587.5 - mdates.date2num(datetime(1970, 1, 1))
+
+        self.figure = Figure(figsize=(4, 4.6), dpi=100)
+        self.ax = self.figure.add_subplot()
+        self.line, = self.ax.plot([], [], marker="o", color="#0000FF", linestyle="-", linewidth=2, markersize=5)
+        self.mean_line, = self.ax.plot([], [], color="#0000FF", linestyle="-", linewidth=2)
+        self.ax.set_title("Pi Memory Game Progress Over Time", fontsize=11)
+        self.ax.set_ylabel("Score (Digits)", fontsize=10)
+        locator = mdates.AutoDateLocator()
+        self.ax.xaxis.set_major_locator(locator)
+        self.ax.xaxis.set_major_formatter(mdates.ConciseDateFormatter(locator))
+        self.ax.grid(True, linestyle="--", alpha=0.7)
+        self.figure.tight_layout()
+
+        self.canvas = FigureCanvasTkAgg(self.figure, master=parent)
+        self.toolbar = NavigationToolbar2Tk(self.canvas, parent, pack_toolbar=False)
+        self.toolbar.update()
+        self.toolbar.pack(side="bottom", fill="x")
+        self.canvas.get_tk_widget().pack(side="top", fill="both", expand=True)
+
+        # Zooming or panning changes how much detail we show
+        self.ax.callbacks.connect("xlim_changed", self.on_zoom)
+
+    # Reset the view to the full history (a couple of index lookups) and redraw
+    def update(self):
+        first, last, low, high = self.scores.bounds()
+        if first is None:
+            return
+        self._updating = True
+        self.ax.set_ylim(low - (high - low) * 0.1 - 5, high + (high - low) * 0.1 + 5)
+        self.ax.set_xlim(self._day_to_num(first) - 1, self._day_to_num(last) + 1)
+        self._updating = False
+        self.refresh_detail()
+
+    def on_zoom(self, ax):
+        if not self._updating:
+            self.refresh_detail()
+
+    @staticmethod
+    def _day_to_num(day):
+        return mdates.date2num(datetime.strptime(day, "%Y-%m-%d"))
+
+    @staticmethod
+    def _num_to_day(num):
+        return mdates.num2date(num).strftime("%Y-%m-%d")
+
+    # Query just the visible range - daily points, or weekly/monthly rollups - and add labels when zoomed in
+    def refresh_detail(self):
+        for label in self.labels:
+            label.remove()
+        self.labels = []
+        if self.band is not None:
+            self.band.remove()
+            self.band = None
+
+        left, right = self.ax.get_xlim()
+        span = right - left
+        # One extra bucket either side so the line/band reaches the edges of the view
+        pad = 1 if span <= self.DAILY_LIMIT else (7 if span <= self.WEEKLY_LIMIT else 31)
+        first, last = self._num_to_day(left - pad), self._num_to_day(right + pad)
+
+        if span <= self.DAILY_LIMIT:
+            rows = self.scores.days_between(first, last)
+            xs = [self._day_to_num(day) for day, _ in rows]
+            ys = [best for _, best in rows]
+            self.line.set_data(xs, ys)
+            self.line.set_visible(True)
+            self.mean_line.set_visible(False)
+            visible = [(x, y) for x, y in zip(xs, ys) if left <= x <= right]
+            if len(visible) <= self.LABEL_LIMIT:
+                for x, y in visible:
+                    self.labels.append(self.ax.annotate(str(y), (x, y), xytext=(0, 5), textcoords="offset points",
+                                                        ha="center", va="bottom", fontsize=8))
+        else:
+            bucket = "week" if span <= self.WEEKLY_LIMIT else "month"
+            rows = self.scores.rollups(first, last, bucket)
+            xs = [jd - self.jd_offset for jd, _, _, _ in rows]
+            self.line.set_visible(False)
+            self.mean_line.set_data(xs, [mean for _, _, mean, _ in rows])
+            self.mean_line.set_visible(True)
+            self.band = self.ax.fill_between(xs, [low for _, low, _, _ in rows], [high for _, _, _, high in rows],
+                                             color="#0000FF", alpha=0.2, linewidth=0)
+
+        self.canvas.draw_idle()
@@ -0,0 +1,282 @@
+# Sound effects for the Pi Memory Game
+# Sounds play on a worker thread so a wrong guess never freezes the window - the key handler just drops a sound
+# name on a queue and carries on. Each sound is rendered once into a PCM buffer and cached, and if sounds pile
+# up faster than they can play the extras are merged or dropped instead of queueing up behind each other.
+#
+# Where the sound actually comes out is a pluggable backend:
+#   winsound    - Windows
+#   simpleaudio - if it's installed (pip install simpleaudio)
+#   aplay       - Linux with ALSA, no extra packages needed
+#   bell        - the Tk window bell, works everywhere Tk does
+#   null        - silent, just records what would have played (for the replay harness and benchmarks)
+# None of them are imported until the first sound plays, so startup stays light.
+#
+# Usage from the command line:
+#   python audio.py                   # play the buzzer and the game over sound on the best backend found
+#   python audio.py --bench           # time play() while a slow backend is busy
+
+import array
+import io
+import math
+import queue
+import shutil
+import subprocess
+import threading
+import time
+import wave
+
+SAMPLE_RATE = 22050
+MAX_PENDING = 2  # most sounds waiting to play - anything past this is dropped
+
+# Each sound is a list of (frequency in Hz, milliseconds) parts - frequency 0 is silence
+SOUNDS = {
+    "buzzer": [(400, 300)],
+    "game_over": [(400, 300), (0, 100), (400, 300)],
+}
+
+_tones = {}  # (sound name, sample rate) -> 16-bit mono PCM bytes
+_wavs = {}  # same thing wrapped as .wav files
+_tones_lock = threading.Lock()
+
+
+# Render a sound to 16-bit mono PCM once and cache it - every later play reuses the same buffer
+def render(name, rate=SAMPLE_RATE):
+    key = (name, rate)
+    with _tones_lock:
+        pcm = _tones.get(key)
+        if pcm is None:
+            samples = array.array("h")
+            for freq, ms in SOUNDS[name]:
+                count = rate * ms // 1000
+                if freq == 0:
+                    samples.extend([0] * count)
+                    continue
+                fade = max(1, min(count // 2, rate // 200))  # 5 ms fade in/out so the tone doesn't click
+                step = 2 * math.pi * freq / rate
+                for i in range(count):
+                    envelope = min(1.0, i / fade, (count - 1 - i) / fade)
+                    samples.append(int(12000 * envelope * math.sin(step * i)))
+            pcm = _tones[key] = samples.tobytes()
+    return pcm
+
+
+# The same sound wrapped up as an in-memory .wav file (what winsound wants)
+def render_wav(name, rate=SAMPLE_RATE):
+    key = (name, rate)
+    with _tones_lock:
+        wav = _wavs.get(key)
+    if wav is None:
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as w:
+            w.setnchannels(1)
+            w.setsampwidth(2)
+            w.setframerate(rate)
+            w.writeframes(render(name, rate))
+        wav = buffer.getvalue()
+        with _tones_lock:
+            _wavs[key] = wav
+    return wav
+
+
+# Length of a sound in seconds
+def duration(name):
+    return sum(ms for _, ms in SOUNDS[name]) / 1000
+
+
+class WinsoundBackend:
+    name = "winsound"
+    threaded = True  # play() blocks until the sound finishes, so run it on the worker thread
+
+    def __init__(self):
+        import winsound
+        self.winsound = winsound
+
+    def play(self, sound):
+        self.winsound.PlaySound(render_wav(sound), self.winsound.SND_MEMORY)
+
+
+class SimpleaudioBackend:
+    name = "simpleaudio"
+    threaded = True
+
+    def __init__(self):
+        import simpleaudio
+        self.simpleaudio = simpleaudio
+
+    def play(self, sound):
+        self.simpleaudio.play_buffer(render(sound), 1, 2, SAMPLE_RATE).wait_done()
+
+
+# Pipes the PCM straight into ALSA's aplay
+class AplayBackend:
+    name = "aplay"
+    threaded = True
+
+    def __init__(self):
+        self.command = shutil.which("aplay")
+        if self.command is None:
+            raise OSError("aplay not found")
+
+    def play(self, sound):
+        subprocess.run([self.command, "-q", "-t", "raw", "-f", "S16_LE", "-c", "1", "-r", str(SAMPLE_RATE)],
+                       input=render(sound), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+
+
+# The Tk bell doesn't block, but Tk isn't thread safe - so this one is called straight from the Tk thread
+class BellBackend:
+    name = "bell"
+    threaded = False
+
+    def __init__(self, root=None):
+        self.root = root
+
+    def play(self, sound):
+        if self.root is not None:
+            for _ in range(sum(1 for freq, _ in SOUNDS[sound] if freq)):  # one ring per tone
+                self.root.bell()
+
+
+# Plays nothing - keeps a list of what it was asked to play, optionally pretending each sound takes real time
+class NullBackend:
+    name = "null"
+
+    def __init__(self, simulate=False):
+        self.simulate = simulate
+        self.threaded = simulate
+        self.played = []
+
+    def play(self, sound):
+        self.played.append(sound)
+        if self.simulate:
+            time.sleep(duration(sound))
+
+
+BACKENDS = {
+    "winsound": WinsoundBackend,
+    "simpleaudio": SimpleaudioBackend,
+    "aplay": AplayBackend,
+    "bell": BellBackend,
+    "null": NullBackend,
+}
+
+
+# Pick a backend by name, or the first one that works on this machine for "auto" - bell is always there
+def choose_backend(name="auto", root=None):
+    if name == "bell":
+        return BellBackend(root)
+    if name != "auto":
+        return BACKENDS[name]()
+    for candidate in (WinsoundBackend, SimpleaudioBackend, AplayBackend):
+        try:
+            return candidate()
+        except (ImportError, OSError):
+            continue
+    return BellBackend(root)
+
+
+class AudioPlayer:
+    # backend can be a backend object or a name from BACKENDS ("auto" picks one the first time a sound plays)
+    def __init__(self, backend="auto", root=None, max_pending=MAX_PENDING):
+        self.root = root
+        self.max_pending = max_pending
+        self._backend = backend if not isinstance(backend, str) else None
+        self._backend_name = backend if isinstance(backend, str) else backend.name
+        self._queue = queue.Queue()
+        self._pending = []  # names of sounds queued but not playing yet
+        self._lock = threading.Lock()
+        self._worker = None
+        self.played = 0
+        self.merged = 0  # same sound already waiting - the new one is folded into it
+        self.dropped = 0  # too many sounds waiting - the new one is skipped
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            self._backend = choose_backend(self._backend_name, self.root)
+        return self._backend
+
+    # Ask for a sound to play - returns right away, True if it was queued
+    def play(self, sound):
+        backend = self.backend
+        if not backend.threaded:
+            backend.play(sound)
+            self.played += 1
+            return True
+        with self._lock:
+            if sound in self._pending:
+                self.merged += 1
+                return False
+            if len(self._pending) >= self.max_pending:
+                self.dropped += 1
+                return False
+            self._pending.append(sound)
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._play_loop, name="audio", daemon=True)
+            self._worker.start()
+        self._queue.put(sound)
+        return True
+
+    def _play_loop(self):
+        # Render everything up front on this thread so no sound is late and the Tk thread never does it
+        for name in SOUNDS:
+            render(name)
+            if self.backend.name == "winsound":
+                render_wav(name)
+        while True:
+            sound = self._queue.get()
+            if sound is None:
+                return
+            with self._lock:
+                self._pending.remove(sound)
+            try:
+                self.backend.play(sound)
+            except Exception:
+                pass  # a broken sound device shouldn't take the game down
+            self.played += 1
+
+    # Wait for queued sounds to finish (up to `timeout` seconds) and stop the worker
+    def close(self, timeout=2):
+        if self._worker is not None and self._worker.is_alive():
+            self._queue.put(None)
+            self._worker.join(timeout)
+        self._worker = None
+
+
+# How long play() takes while a backend that really takes 300 ms per sound is busy, plus what got merged/dropped
+def bench(presses=200):
+    player = AudioPlayer(NullBackend(simulate=True))
+    for sound in SOUNDS:
+        render(sound)
+    times = []
+    for i in range(presses):
+        started = time.perf_counter_ns()
+        player.play("game_over" if i % 10 == 9 else "buzzer")
+        times.append(time.perf_counter_ns() - started)
+    times.sort()
+    print(f"play() over {presses} calls: median {times[len(times) // 2] / 1000:.1f} us, "
+          f"max {times[-1] / 1000:.1f} us")
+    print(f"queued {presses - player.merged - player.dropped}, merged {player.merged}, dropped {player.dropped}")
+    player.close(timeout=0)
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Pi Memory Game sound check")
+    parser.add_argument("--backend", default="auto", choices=["auto", *BACKENDS], help="backend to use")
+    parser.add_argument("--bench", action="store_true", help="time play() against a slow fake backend")
+    args = parser.parse_args(argv)
+
+    if args.bench:
+        bench()
+        return
+    player = AudioPlayer(args.backend)
+    print(f"Playing on {player.backend.name}")
+    for sound in SOUNDS:
+        player.play(sound)
+        time.sleep(duration(sound) + 0.2)
+    player.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+# Sequence search for the Pi Memory Game ("where does my birthday show up in pi?")
+# A k-mer position table over the digit file, saved next to it as pi_digits.bin.idx and memory-mapped at query
+# time. For every k digit number (k is 5-7 depending on how many digits there are) the table lists every
+# position it starts at, in order. A search looks up the rarest k digit window of the query and only checks
+# those few candidates against the digits, so it costs about the same at 100,000 digits or 10 million.
+#
+# Queries shorter than k use the run of k-mers that start with them (or a straight scan when they're so common
+# it finds them instantly). numpy makes building the index a lot faster but isn't needed.
+#
+# File layout (all numbers little-endian):
+#   header     - magic, k, number of digits the index was built from
+#   offsets    - 10**k + 1 uint32s, positions of k-mer v are positions[offsets[v]:offsets[v + 1]]
+#   positions  - one uint32 per k-mer in the digit file, grouped by k-mer and in order within each group
+#
+# Usage:
+#   python digit_index.py                  # build the index for pi_digits.bin
+#   python digit_index.py 0314 --all       # where does 0314 show up?
+#   python digit_index.py --bench          # time random searches
+
+import argparse
+import array
+import math
+import mmap
+import os
+import random
+import struct
+import sys
+import time
+
+from digit_source import load_digit_source
+
+MAGIC = b"PIIDX1\n\0"
+HEADER = struct.Struct("<8sIQ")  # magic, k, digit count
+MAX_RESULTS = 1000  # default cap on how many occurrences find_all returns
+
+
+# Where the index for a digit source lives (None for in-memory digits)
+def index_path(digits):
+    return digits.path + ".idx" if digits.path else None
+
+
+# Pick k so there's roughly one position per k-mer - short lists to check, without a huge offsets table
+def choose_k(count):
+    return max(5, min(7, round(math.log10(max(count, 1)))))
+
+
+# Build the offsets and positions tables for a run of ASCII digits - returns both as little-endian bytes
+def _build_tables(text, k):
+    buckets = 10 ** k
+    kmers = max(0, len(text) - k + 1)
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+
+    if np is not None:
+        values = np.frombuffer(text, dtype=np.uint8).astype(np.uint32) - 48
+        codes = np.zeros(kmers, dtype=np.uint32)
+        for j in range(k):
+            codes = codes * 10 + values[j:j + kmers]
+        positions = np.argsort(codes, kind="stable").astype("<u4")
+        offsets = np.zeros(buckets + 1, dtype="<u4")
+        np.cumsum(np.bincount(codes, minlength=buckets), out=offsets[1:])
+        return offsets.tobytes(), positions.tobytes()
+
+    # Plain Python counting sort - two passes over the k-mers
+    codes = array.array("I", bytes(4 * kmers))
+    value = 0
+    for i, byte in enumerate(text):
+        value = (value * 10 + byte - 48) % buckets
+        if i >= k - 1:
+            codes[i - k + 1] = value
+    offsets = array.array("I", bytes(4 * (buckets + 1)))
+    for code in codes:
+        offsets[code + 1] += 1
+    for v in range(buckets):
+        offsets[v + 1] += offsets[v]
+    fill = array.array("I", offsets)
+    positions = array.array("I", bytes(4 * kmers))
+    for i, code in enumerate(codes):
+        positions[fill[code]] = i
+        fill[code] += 1
+    if sys.byteorder == "big":
+        offsets.byteswap()
+        positions.byteswap()
+    return offsets.tobytes(), positions.tobytes()
+
+
+class DigitIndex:
+    def __init__(self, digits, buffer, file=None):
+        self.digits = digits
+        self._buffer = buffer
+        self._file = file
+        if len(buffer) < HEADER.size:
+            raise ValueError("digit index is cut short")
+        magic, self.k, self.count = HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC or not 1 <= self.k <= 9:
+            raise ValueError("not a digit index")
+        self._offsets = HEADER.size
+        self._positions = self._offsets + 4 * (10 ** self.k + 1)
+        # A truncated or padded file would only show up as struct errors in the middle of a search
+        if len(buffer) != self._positions + 4 * max(0, self.count - self.k + 1):
+            raise ValueError("digit index is the wrong size")
+
+    # Build the index for a digit source - written to `path` (then memory-mapped) or kept in memory if path is None
+    @classmethod
+    def build(cls, digits, path=None, k=None):
+        k = k or choose_k(len(digits))
+        offsets, positions = _build_tables(digits.digits(0, len(digits)).encode("ascii"), k)
+        header = HEADER.pack(MAGIC, k, len(digits))
+        if path is None:
+            return cls(digits, header + offsets + positions)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(header)
+            f.write(offsets)
+            f.write(positions)
+        os.replace(tmp_path, path)
+        return cls.open(digits, path)
+
+    # Memory-map an existing index - None if it's missing, damaged or was built from a different number of digits
+    @classmethod
+    def open(cls, digits, path):
+        if not path or not os.path.exists(path):
+            return None
+        f = open(path, "rb")
+        buffer = None
+        try:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            index = cls(digits, buffer, file=f)
+        except (OSError, ValueError):
+            if buffer is not None:
+                buffer.close()
+            f.close()
+            return None  # treated as stale - load_index builds a fresh one
+        if index.count != len(digits):
+            index.close()  # stale - the digit file has grown since the index was built
+            return None
+        return index
+
+    # Where k-mer `value` starts in the positions table (value 10**k gives the end of the table)
+    def _offset(self, value):
+        return struct.unpack_from("<I", self._buffer, self._offsets + 4 * value)[0]
+
+    def _read_positions(self, lo, hi):
+        positions = array.array("I")
+        positions.frombytes(self._buffer[self._positions + 4 * lo:self._positions + 4 * hi])
+        if sys.byteorder == "big":
+            positions.byteswap()
+        return positions
+
+    # Every position (in order) the digit string starts at, up to `limit` of them
+    def find_all(self, sequence, limit=MAX_RESULTS):
+        if not sequence.isdigit():
+            raise ValueError("search for digits only")
+        if len(sequence) < self.k:
+            return self._find_short(sequence, limit)
+
+        # Use whichever k digit window of the query has the fewest candidates
+        best = None
+        for j in range(len(sequence) - self.k + 1):
+            value = int(sequence[j:j + self.k])
+            lo, hi = self._offset(value), self._offset(value + 1)
+            if best is None or hi - lo < best[2] - best[1]:
+                best = (j, lo, hi)
+        j, lo, hi = best
+
+        found = []
+        for position in self._read_positions(lo, hi):
+            start = position - j
+            if start >= 0 and self.digits.digits(start, start + len(sequence)) == sequence:
+                found.append(start)
+                if limit and len(found) >= limit:
+                    break
+        return found
+
+    # Queries shorter than k - every k-mer starting with the query sits in one run of the positions table
+    def _find_short(self, sequence, limit):
+        shift = 10 ** (self.k - len(sequence))
+        lo, hi = self._offset(int(sequence) * shift), self._offset((int(sequence) + 1) * shift)
+        if limit and hi - lo > 50 * limit:
+            return scan_all(self.digits, sequence, limit)  # so common a straight scan finds enough right away
+        found = sorted(self._read_positions(lo, hi))
+        # The last k - 1 digits don't start a full k-mer, so check those directly
+        position = self.digits.find(sequence, max(0, self.count - self.k + 1))
+        while position != -1:
+            found.append(position)
+            position = self.digits.find(sequence, position + 1)
+        return found[:limit] if limit else found
+
+    # First position the digit string starts at, or -1
+    def find(self, sequence):
+        found = self.find_all(sequence, limit=1)
+        return found[0] if found else -1
+
+    def close(self):
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+# Search without an index - a straight scan of the digits (fast for short queries, they turn up early)
+def scan_all(digits, sequence, limit=MAX_RESULTS):
+    found = []
+    position = digits.find(sequence)
+    while position != -1:
+        found.append(position)
+        if limit and len(found) >= limit:
+            break
+        position = digits.find(sequence, position + 1)
+    return found
+
+
+# Open the index for a digit source, building it first if it's missing or stale
+# Big digit files are only indexed when build_limit allows it - otherwise None (callers fall back to scan_all)
+def load_index(digits, build_limit=1_000_000):
+    path = index_path(digits)
+    index = DigitIndex.open(digits, path)
+    if index is None and len(digits) <= build_limit:
+        try:
+            index = DigitIndex.build(digits, path)
+        except OSError:
+            index = DigitIndex.build(digits)  # can't write next to the digit file - keep it in memory
+    return index
+
+
+# Time random searches of a few lengths against the index (and the plain scan for comparison)
+def bench(digits, index, searches=200, seed=314):
+    rng = random.Random(seed)
+    print(f"{len(digits):,} digits, k = {index.k}")
+    for length in (4, 6, 8, 10):
+        queries = ["".join(rng.choice("0123456789") for _ in range(length)) for _ in range(searches)]
+        for name, search in (("index", index.find_all), ("scan", lambda q: scan_all(digits, q))):
+            times = []
+            for query in queries:
+                started = time.perf_counter()
+                search(query)
+                times.append(time.perf_counter() - started)
+            times.sort()
+            print(f"  {length:>2} digits {name:>5}: median {times[len(times) // 2] * 1000:.3f} ms, "
+                  f"max {times[-1] * 1000:.3f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or search the Pi Memory Game digit index")
+    parser.add_argument("sequence", nargs="?", help="digits to search for")
+    parser.add_argument("--digits", help="digit file (default: pi_digits.bin)")
+    parser.add_argument("--all", action="store_true", help="list every occurrence, not just the first")
+    parser.add_argument("--rebuild", action="store_true", help="rebuild the index even if it's up to date")
+    parser.add_argument("--bench", action="store_true", help="time random searches")
+    args = parser.parse_args(argv)
+
+    digits = load_digit_source(args.digits) if args.digits else load_digit_source()
+    path = index_path(digits)
+    index = None if args.rebuild else DigitIndex.open(digits, path)
+    if index is None:
+        started = time.perf_counter()
+        index = DigitIndex.build(digits, path)
+        print(f"Indexed {len(digits):,} digits in {time.perf_counter() - started:.2f}s"
+              + (f" -> {path}" if path else " (in memory)"))
+
+    if args.bench:
+        bench(digits, index)
+    elif args.sequence:
+        found = index.find_all(args.sequence, limit=None if args.all else 1)
+        if not found:
+            print(f"{args.sequence} isn't in the first {len(digits):,} digits")
+        for position in found:
+            print(f"{args.sequence} starts at digit {position + 1:,} after the decimal point")
+    index.close()
+
+
+if __name__ == "__main__":
+    main()
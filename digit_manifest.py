@@ -0,0 +1,207 @@
+# Integrity manifest for the Pi Memory Game digit file
+# pi_digits.bin ships with pi_digits.bin.manifest - one entry per 64 KiB chunk with a BLAKE2b hash of the chunk
+# plus two running sums (of the bytes, and of each byte times its position). The hash tells us a chunk is bad;
+# the sums pin a single wrong digit down to its exact offset (and what it should have been) without needing
+# the real digits. Anything messier is reported as the first non-digit byte, or the whole chunk.
+#
+# DigitSource checks each chunk the first time a digit in it is read, so startup never reads the whole file.
+# This script checks every chunk at once, spread across a process pool.
+#
+# File layout (little-endian):
+#   header  - magic, chunk size, number of digits covered
+#   entries - 16 byte BLAKE2b digest, sum of bytes (uint64), sum of (position + 1) * byte (uint64) per chunk
+#
+# Usage:
+#   python digit_manifest.py                 # verify every chunk of pi_digits.bin in parallel
+#   python digit_manifest.py --build         # write (or rewrite) the manifest for pi_digits.bin
+
+import argparse
+import hashlib
+import mmap
+import operator
+import os
+import struct
+import sys
+import time
+
+CHUNK_SIZE = 64 * 1024
+MAGIC = b"PIMAN1\n\0"
+HEADER = struct.Struct("<8sIQ")  # magic, chunk size, digit count
+ENTRY = struct.Struct("<16sQQ")  # digest, byte sum, weighted byte sum
+CHUNKS_PER_TASK = 16  # chunks each worker checks per task during a full verify
+
+
+class CorruptDigitsError(ValueError):
+    def __init__(self, offset, message):
+        super().__init__(f"digit file is corrupt at offset {offset}: {message}")
+        self.offset = offset  # byte offset in the digit file (= digit index after the "3.")
+
+
+# Where the manifest for a digit file lives
+def manifest_path(digits_path):
+    return digits_path + ".manifest"
+
+
+# Hash and sums for one chunk of the digit file
+def chunk_entry(data):
+    digest = hashlib.blake2b(data, digest_size=16).digest()
+    return digest, sum(data), sum(map(operator.mul, range(1, len(data) + 1), data))
+
+
+# Write the manifest for a block of ASCII digits (the whole digit file)
+def write_manifest(path, data, chunk_size=CHUNK_SIZE):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, chunk_size, len(data)))
+        view = memoryview(data)
+        for start in range(0, len(data), chunk_size):
+            f.write(ENTRY.pack(*chunk_entry(view[start:start + chunk_size])))
+    os.replace(tmp_path, path)
+
+
+# Work out where a chunk that failed its hash went wrong - returns (offset, message)
+def locate(data, base, expected_length, digest, expected_sum, expected_weighted):
+    if len(data) < expected_length:
+        return base + len(data), f"file ends here, {expected_length - len(data)} digit(s) short"
+    # One changed byte at position p moves the sums by d and (p + 1) * d - so p falls straight out.
+    # Several changes can fake that, so the fix is only reported if the patched chunk matches the hash.
+    delta = sum(data) - expected_sum
+    weighted = sum(map(operator.mul, range(1, len(data) + 1), data)) - expected_weighted
+    if delta and weighted % delta == 0:
+        position = weighted // delta - 1
+        if 0 <= position < len(data) and 48 <= data[position] - delta <= 57:
+            fixed = bytearray(data)
+            fixed[position] -= delta
+            if hashlib.blake2b(fixed, digest_size=16).digest() == digest:
+                return base + position, f"found {chr(data[position])!r}, should be {chr(fixed[position])}"
+    for position, byte in enumerate(data):
+        if not 48 <= byte <= 57:
+            return base + position, f"found {chr(byte)!r}, not a digit"
+    return base, f"offsets {base}-{base + expected_length - 1} don't match their hash"
+
+
+class Manifest:
+    # buffer holds the manifest file (bytes or an mmap) - entries are only unpacked when a chunk gets checked
+    # Anything wrong with the header or size is a ValueError, so callers can fall back instead of crashing
+    def __init__(self, buffer, file=None):
+        if len(buffer) < HEADER.size:
+            raise ValueError("digit manifest is cut short")
+        magic, self.chunk_size, self.count = HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise ValueError("not a digit manifest")
+        if not self.chunk_size:
+            raise ValueError("digit manifest has a chunk size of 0")
+        self.chunks = (self.count + self.chunk_size - 1) // self.chunk_size
+        if len(buffer) < HEADER.size + self.chunks * ENTRY.size:
+            raise ValueError("digit manifest is cut short")
+        self._buffer = buffer
+        self._file = file
+
+    # Memory-map a manifest file - None if there isn't one
+    @classmethod
+    def open(cls, path):
+        if not os.path.exists(path):
+            return None
+        f = open(path, "rb")
+        buffer = None
+        try:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)  # an empty file is a ValueError here too
+            return cls(buffer, file=f)
+        except (OSError, ValueError):
+            if buffer is not None:
+                buffer.close()
+            f.close()
+            raise
+
+    # Check one chunk of the digit file - raises CorruptDigitsError at the exact offset if it's wrong
+    def check(self, chunk, data):
+        base = chunk * self.chunk_size
+        expected_length = min(self.chunk_size, self.count - base)
+        data = data[:expected_length]  # the last chunk may run into digits added after the manifest was written
+        digest, total, weighted = ENTRY.unpack_from(self._buffer, HEADER.size + chunk * ENTRY.size)
+        if len(data) == expected_length and hashlib.blake2b(data, digest_size=16).digest() == digest:
+            return
+        raise CorruptDigitsError(*locate(data, base, expected_length, digest, total, weighted))
+
+    def close(self):
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+# Worker for the full verify - checks chunks [first, last) and returns (offset, message) for each bad one
+def _verify_chunks(digits_path, path, first, last):
+    problems = []
+    manifest = Manifest.open(path)
+    with open(digits_path, "rb") as f:
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if os.fstat(f.fileno()).st_size else b""
+        try:
+            for chunk in range(first, last):
+                try:
+                    manifest.check(chunk, data[chunk * manifest.chunk_size:(chunk + 1) * manifest.chunk_size])
+                except CorruptDigitsError as error:
+                    problems.append((error.offset, str(error)))
+        finally:
+            if isinstance(data, mmap.mmap):
+                data.close()
+            manifest.close()
+    return problems
+
+
+# Check every chunk of a digit file against its manifest on a process pool - returns a sorted list of problems
+def verify_file(digits_path, path=None, workers=None):
+    from concurrent.futures import ProcessPoolExecutor
+
+    path = path or manifest_path(digits_path)
+    manifest = Manifest.open(path)
+    if manifest is None:
+        return [(0, f"no manifest at {path} - run python digit_manifest.py --build")]
+    chunks, count = manifest.chunks, manifest.count
+    manifest.close()
+
+    problems = []
+    size = os.path.getsize(digits_path)
+    if size > count:
+        problems.append((count, f"{size - count} digit(s) past the end of the manifest aren't covered"))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        tasks = [pool.submit(_verify_chunks, digits_path, path, first, min(first + CHUNKS_PER_TASK, chunks))
+                 for first in range(0, chunks, CHUNKS_PER_TASK)]
+        for task in tasks:
+            problems.extend(task.result())
+    return sorted(problems)
+
+
+def main(argv=None):
+    from digit_source import DIGITS_FILE
+
+    parser = argparse.ArgumentParser(description="Build or check the Pi Memory Game digit manifest")
+    parser.add_argument("--digits", default=DIGITS_FILE, help="digit file (default: pi_digits.bin)")
+    parser.add_argument("--build", action="store_true", help="write the manifest instead of checking it")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    if args.build:
+        with open(args.digits, "rb") as f:
+            write_manifest(manifest_path(args.digits), f.read())
+        print(f"Wrote {manifest_path(args.digits)} in {time.perf_counter() - started:.2f}s")
+        return 0
+
+    try:
+        problems = verify_file(args.digits, workers=args.workers)
+    except (OSError, ValueError) as error:
+        print(f"Can't check {args.digits}: {error} - rebuild the manifest with python digit_manifest.py --build")
+        return 1
+    elapsed = time.perf_counter() - started
+    size = os.path.getsize(args.digits)
+    for offset, message in problems:
+        print(message)
+    status = "OK" if not problems else f"{len(problems)} problem(s)"
+    print(f"{status} - checked {size:,} digits in {elapsed:.2f}s ({size / max(elapsed, 1e-9) / 1e6:.0f} MB/s)")
+    return 0 if not problems else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+# Digit store for the Pi Memory Game
+# The digits of pi live in a flat file (pi_digits.bin) with one ASCII byte per digit after the "3."
+# The file is memory-mapped so the OS only pages in the parts we actually read - that way startup
+# and memory stay the same whether the file holds 500 digits or 10 million.
+
+import mmap
+import os
+
+from digit_manifest import CorruptDigitsError, Manifest, manifest_path
+
+# Default location of the digit store, next to the game files
+DIGITS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pi_digits.bin")
+
+# The original 500 digits after "3." - only used if the digit file is missing
+FALLBACK_DIGITS = ("1415926535897932384626433832795028841971693993751058209749445923078164062862089986280348253421170679"
+                   "8214808651328230664709384460955058223172535940812848111745028410270193852110555964462294895493038196"
+                   "4428810975665933446128475648233786783165271201909145648566923460348610454326648213393607260249141273"
+                   "7245870066063155881748815209209628292540917153643678925903600113305305488204665213841469519415116094"
+                   "3305727036575959195309218611738193261179310511854807446237996274956735188575272489122793818301194912")
+
+
+class DigitSource:
+    # Wrap any bytes-like buffer (bytes or an mmap) holding ASCII digits
+    # Index 0 is the first digit after the decimal point
+    def __init__(self, buffer, file=None, path=None, manifest=None):
+        self._buffer = buffer
+        self._file = file
+        self._length = len(buffer)
+        self.path = path  # the digit file this came from (None for in-memory digits)
+        self.unverified = 0  # digits in the file past the end of the manifest - ignored (load_digit_source warns)
+
+        # With a manifest each 64 KiB chunk is hash checked the first time a digit in it is read
+        self.manifest = manifest
+        self._verified = None
+        if manifest is not None:
+            if self._length < manifest.count:
+                # Cut short - no need to wait for the player to get there
+                raise CorruptDigitsError(self._length, f"file ends here, {manifest.count - self._length} digit(s) short")
+            self.unverified = self._length - manifest.count
+            self._length = manifest.count
+            self._chunk_size = manifest.chunk_size
+            self._verified = bytearray(manifest.chunks)
+
+    # Open a digit file and memory-map it read-only - nothing is read until a digit is asked for
+    # If the file has a manifest (pi_digits.bin.manifest) it's memory-mapped too and chunks get checked lazily
+    @classmethod
+    def from_file(cls, path=DIGITS_FILE):
+        manifest = Manifest.open(manifest_path(path))
+        f = open(path, "rb")
+        try:
+            if os.fstat(f.fileno()).st_size == 0:
+                f.close()
+                return cls(b"", path=path, manifest=manifest)  # mmap can't map an empty file
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ), file=f, path=path, manifest=manifest)
+        except (OSError, ValueError):
+            f.close()
+            if manifest is not None:
+                manifest.close()
+            raise
+
+    # Build a source from a plain string of digits (handy for the fallback and for testing)
+    @classmethod
+    def from_string(cls, digits):
+        return cls(digits.encode("ascii"))
+
+    # Number of digits available after the decimal point
+    def __len__(self):
+        return self._length
+
+    # Hash check every chunk in [start, stop) that hasn't been checked yet - raises CorruptDigitsError
+    def _verify(self, start, stop):
+        for chunk in range(start // self._chunk_size, (stop - 1) // self._chunk_size + 1):
+            if not self._verified[chunk]:
+                self.manifest.check(chunk, self._buffer[chunk * self._chunk_size:(chunk + 1) * self._chunk_size])
+                self._verified[chunk] = 1
+
+    # Return the digit at the given position as a one character string
+    def digit(self, index):
+        if index < 0 or index >= self._length:
+            raise IndexError("digit index out of range")
+        if self._verified is not None and not self._verified[index // self._chunk_size]:
+            self._verify(index, index + 1)
+        return chr(self._buffer[index])
+
+    # Return the digits in [start, stop) as a string - clipped to the end of the store like a normal slice
+    def digits(self, start, stop):
+        start = max(start, 0)
+        stop = min(stop, self._length)
+        if start >= stop:
+            return ""
+        if self._verified is not None:
+            self._verify(start, stop)
+        return self._buffer[start:stop].decode("ascii")
+
+    # Position of the first occurrence of a digit string at or after `start`, or -1 - a straight scan, see
+    # digit_index.py for the indexed search. Only digits covered by the manifest are searched (and checked)
+    def find(self, sequence, start=0):
+        start = max(start, 0)
+        position = self._buffer.find(sequence.encode("ascii"), start, self._length)
+        if self._verified is not None and start < self._length:
+            self._verify(start, self._length if position == -1 else position + len(sequence))
+        return position
+
+    # Release the memory map and the file handle
+    def close(self):
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self.manifest is not None:
+            self.manifest.close()
+            self.manifest = None
+            self._verified = None
+        self._buffer = b""
+        self._length = 0
+
+
+# Open the default digit store, falling back to the built-in 500 digits if the file isn't there (or is damaged)
+def load_digit_source(path=DIGITS_FILE):
+    if os.path.exists(path):
+        try:
+            source = DigitSource.from_file(path)
+            if source.unverified:
+                print(f"{source.unverified} digit(s) at the end of {path} aren't in its manifest and won't be used - "
+                      f"run python digit_manifest.py --build")
+            return source
+        except CorruptDigitsError as error:
+            print(f"{error} - using the built-in 500 digits")
+        except (OSError, ValueError) as error:
+            print(f"Could not open digit file {path} ({error}), using the built-in 500 digits")
+    return DigitSource.from_string(FALLBACK_DIGITS)
@@ -0,0 +1,137 @@
+# Game rules for the Pi Memory Game, with no Tk in sight
+# PiEngine holds the game state and decides what happens on every keystroke - the Tk window (pi_game.py)
+# just draws whatever comes back. That means the rules can be replayed and benchmarked without a display.
+
+import time
+from collections import deque, namedtuple
+
+MAX_WRONG_GUESSES = 3
+
+# What the UI should do after a keystroke:
+#   display   - new text for the digit display (None = leave it alone), shown in `color`
+#   feedback  - new text for the feedback label
+#   buzzes    - how many times to play the buzzer
+#   game_over - True when this keystroke ended a Real Game (score is then the final score)
+#   reveal    - the next digits to show in a popup at game over ("" otherwise)
+KeyResult = namedtuple("KeyResult", "display color feedback buzzes game_over score new_high reveal")
+
+
+class PiEngine:
+    def __init__(self, digits, high_score=0, log=None):
+        self.digits = digits  # a DigitSource - index 0 is the first digit after "3."
+        self.high_score = high_score
+        self.log = log  # optional KeystrokeLog - every digit entered gets recorded in it
+        self.hot_spots = {}  # {first position of a 10 digit chunk: error rate} the player often misses (keylog.py)
+        self.mode = "practice"
+        self.position = 0  # How many digits the player has entered correctly (also the score)
+        self.display_window = deque("3.", maxlen=6)  # The last 6 characters shown on screen
+        self.game_active = True  # Controls whether the game is ongoing
+        self.wrong_guesses = 0  # Counts mistakes in Real Game mode
+        self.show_hint = False  # Toggles hint display in Practice Mode
+        self.wrong_positions = []  # Digit positions the player got wrong this game (saved with the score)
+        self.start_offset = 0  # Where in pi this game started (Practice Mode can start anywhere)
+        self.started_at = time.monotonic()
+
+    # Start (or restart) a game in "practice" or "real" mode
+    # Practice Mode can start at any digit offset (0 = the first digit after "3.") - Real Games always start at 0
+    def start(self, mode, offset=0):
+        self.mode = mode
+        offset = min(max(offset, 0), len(self.digits)) if mode == "practice" else 0
+        self.start_offset = offset
+        self.position = offset
+        self.display_window.clear()
+        self.display_window.extend("3." + self.digits.digits(max(0, offset - 6), offset))
+        self.game_active = True
+        self.wrong_guesses = 0
+        self.show_hint = False
+        self.wrong_positions = []
+        self.started_at = time.monotonic()
+        if self.log is not None:
+            self.log.start(mode, offset)
+
+    # Digits entered correctly this game (the same as the position unless practice started further in)
+    def entered(self):
+        return self.position - self.start_offset
+
+    # Seconds since the current game started
+    def duration(self):
+        return time.monotonic() - self.started_at
+
+    # Text to show in the feedback label when a game starts
+    def start_message(self):
+        if self.mode == "practice":
+            if self.start_offset:
+                return f"Starting at digit {self.start_offset + 1} - keep going"
+            return "Start with 1"
+        return f"Start with 1 - {MAX_WRONG_GUESSES} guesses left"
+
+    # Handle one digit - returns a KeyResult, or None if the keystroke should be ignored
+    def enter_digit(self, digit):
+        if len(digit) != 1 or digit not in "0123456789":
+            return None  # modifier keys and the like come through with an empty char
+        practice = self.mode == "practice"
+        if not self.game_active and not practice:
+            return None  # Don't allow input if the game is over
+
+        # Calculate the index of the next digit to check (digits after the "3.")
+        next_index = self.position
+
+        # Check if the player has reached the end of the Pi digits
+        if next_index >= len(self.digits):
+            self.game_active = False
+            return KeyResult("You reached the end!", "green", f"You got all {len(self.digits)} digits!", 1, False, None, False, "")
+
+        # Check if the entered digit is correct
+        correct_digit = self.digits.digit(next_index)
+        if self.log is not None:
+            self.log.record(next_index, digit, digit == correct_digit)
+        if digit == correct_digit:
+            # Move the cursor and slide the 6 character display window along - same cost at digit 10 or 1,000,000
+            self.position += 1
+            self.display_window.append(digit)
+            display_text = "".join(self.display_window)
+            if practice:
+                if self.show_hint:
+                    self.show_hint = False
+                    feedback = "Back to normal - keep going"
+                elif self.position in self.hot_spots:
+                    feedback = f"Careful - digits {self.position + 1}-{self.position + 10} are one of your tricky spots"
+                else:
+                    feedback = "Nice one! Keep going"
+            else:
+                feedback = f"Correct - {MAX_WRONG_GUESSES - self.wrong_guesses} guesses left"
+            return KeyResult(display_text, "green", feedback, 0, False, None, False, "")
+
+        display_text = "".join(self.display_window)
+        self.wrong_positions.append(next_index)
+        # In Practice Mode show the correct digit and the next 5 to help the player learn
+        if practice:
+            self.show_hint = True
+            chunk = next_index - next_index % 10
+            if chunk in self.hot_spots:
+                # One of the player's tricky spots - show the rest of the chunk so they can drill all of it
+                rest = self.digits.digits(next_index, chunk + 10)
+                feedback = f"Incorrect, the next number was {correct_digit} - tricky spot, the rest of it: {rest}"
+            else:
+                next_five = self.digits.digits(next_index, next_index + 5)
+                feedback = f"Incorrect, the next number was {correct_digit} - Next 5: {next_five}"
+            return KeyResult(display_text, "green", feedback, 0, False, None, False, "")
+
+        # In Real Game mode count wrong guesses and end after 3
+        self.wrong_guesses += 1
+        if self.wrong_guesses < MAX_WRONG_GUESSES:
+            feedback = f"Wrong! {MAX_WRONG_GUESSES - self.wrong_guesses} guesses left - try again"
+            return KeyResult(display_text, "green", feedback, 1, False, None, False, "")
+
+        self.game_active = False
+        score = self.position
+        # Update all-time high score if applicable
+        new_high = score > self.high_score
+        if new_high:
+            self.high_score = score
+            feedback = f"Game Over! New high score: {score}"
+        else:
+            feedback = f"Game Over! Score: {score}"
+        # Show the next 10 digits for reference
+        next_ten = self.digits.digits(next_index, next_index + 10)
+        return KeyResult(None, "green", feedback, 2, True, score, new_high, next_ten)
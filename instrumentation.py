@@ -0,0 +1,126 @@
+# Latency instrumentation for the Pi Memory Game
+# Times each phase of handling a keystroke (key handling, engine, widget updates, audio, saves) plus the
+# score database's background write transactions (one per batch of games, commit included) and bind_keys
+# with perf_counter_ns. Each phase keeps a small fixed-size histogram,
+# so we can read p50/p95/p99 at any point without storing every sample.
+# The numbers can be dumped to a file or shown on the F12 debug overlay.
+
+import threading
+import time
+from contextlib import contextmanager
+
+PHASES = ("key", "engine", "widgets", "audio", "save", "db_write", "bind")
+SUB_BUCKETS = 16  # buckets per power of two - keeps every bucket within ~6% of the real value
+
+
+# Log-linear histogram of nanosecond timings - constant memory however many samples go in
+class LatencyHistogram:
+    def __init__(self):
+        self.counts = [0] * (64 * SUB_BUCKETS + 2 * SUB_BUCKETS)
+        self.total = 0
+        self.max_ns = 0
+
+    # Map a value to its bucket - small values get exact buckets, bigger ones share a bucket per ~6% range
+    @staticmethod
+    def bucket(ns):
+        shift = max(ns.bit_length() - 5, 0)
+        return shift * SUB_BUCKETS + (ns >> shift)
+
+    # Highest value that lands in a bucket - used when reading percentiles back out
+    @staticmethod
+    def bucket_limit(index):
+        shift = max(index // SUB_BUCKETS - 1, 0)
+        return ((index - shift * SUB_BUCKETS) + 1 << shift) - 1
+
+    def record(self, ns):
+        self.counts[self.bucket(ns)] += 1
+        self.total += 1
+        if ns > self.max_ns:
+            self.max_ns = ns
+
+    # Value (in ns) below which the given fraction of samples fall
+    def percentile(self, fraction):
+        if not self.total:
+            return 0
+        wanted = max(1, int(self.total * fraction + 0.5))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= wanted:
+                return min(self.bucket_limit(index), self.max_ns)
+        return self.max_ns
+
+
+class LatencyRecorder:
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.histograms = {name: LatencyHistogram() for name in PHASES}
+        self._lock = threading.Lock()  # the score writer thread records "db_write" timings too
+
+    # Time a block of code - with timing switched off this is just a cheap no-op
+    @contextmanager
+    def phase(self, name):
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter_ns() - start)
+
+    def record(self, name, ns):
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = LatencyHistogram()
+            histogram.record(ns)
+
+    # One line per phase with the sample count and p50/p95/p99/max in microseconds
+    def summary_lines(self):
+        lines = []
+        with self._lock:
+            for name, histogram in self.histograms.items():
+                if not histogram.total:
+                    continue
+                p50, p95, p99 = (histogram.percentile(f) / 1000 for f in (0.50, 0.95, 0.99))
+                lines.append(f"{name:<8} n={histogram.total:<7} p50={p50:.0f}us p95={p95:.0f}us "
+                             f"p99={p99:.0f}us max={histogram.max_ns / 1000:.0f}us")
+        return lines
+
+    # Write the summary to a file
+    def dump(self, path):
+        with open(path, "w") as f:
+            f.write("\n".join(self.summary_lines()) + "\n")
+        print(f"Saved latency histograms to {path}")
+
+
+# Small label in the top right corner of the window showing the live percentiles - toggled with F12
+class DebugOverlay:
+    REFRESH_MS = 500
+
+    def __init__(self, root, recorder):
+        self.root = root
+        self.recorder = recorder
+        self.label = None
+        self._after_id = None
+
+    def toggle(self, event=None):
+        if self.label is None:
+            import tkinter as tk
+            self.label = tk.Label(self.root, font=("Courier", 8), justify="left", bg="black", fg="lime")
+            self.label.place(relx=1.0, rely=0.0, anchor="ne")
+            self.refresh()
+        else:
+            if self._after_id is not None:
+                self.root.after_cancel(self._after_id)
+                self._after_id = None
+            self.label.destroy()
+            self.label = None
+
+    def refresh(self):
+        if self.label is None:
+            return
+        self.label.config(text="\n".join(self.recorder.summary_lines()) or "no samples yet")
+        self.label.lift()
+        self._after_id = self.root.after(self.REFRESH_MS, self.refresh)
@@ -0,0 +1,314 @@
+# Keystroke log for the Pi Memory Game
+# Every digit typed in a game goes into a small array-backed buffer - which digit position it was for, the digit
+# entered, whether it was right and how long since the previous key - and each game is flushed to its own
+# struct-packed binary file in keylogs/. 10 bytes a keystroke, so even a very long recitation is a few KB.
+#
+# The analysis side memory-maps every log with numpy and works out, per digit position, how often it's missed
+# and how long you hesitate before it, then ranks the 10 digit chunks that trip you up most. Practice Mode uses
+# those hot spots to warn you before you reach one. numpy is only needed for the analysis, not the logging.
+#
+# So the analysis doesn't slow down as the history grows, everything but the newest KEEP_LOGS logs gets rolled
+# into a running totals file (keylogs/summary.npz) and deleted. The summary remembers the last log it took in,
+# so a log that's been counted is never counted twice even if deleting it fails.
+#
+# File layout (little-endian):
+#   header  - magic, mode (0 practice, 1 real), start time (unix seconds), digit offset the game started at
+#   records - position uint32, digit uint8, correct uint8, microseconds since the previous key uint32
+#
+# Usage:
+#   python keylog.py                      # your hardest chunks and positions from keylogs/ (compacts old logs)
+#   python keylog.py --bench              # time the analysis over thousands of synthetic sessions
+
+import argparse
+import array
+import itertools
+import os
+import random
+import struct
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+LOG_DIR = "keylogs"
+MAGIC = b"PIKEY1\n\0"
+HEADER = struct.Struct("<8sBdI")  # magic, mode, start time, start offset
+RECORD = struct.Struct("<IBBI")  # position, digit, correct, delta in microseconds
+FLUSH_EVERY = 8192  # keystrokes buffered before they're written out
+CHUNK = 10  # digits per hot spot chunk
+MIN_ATTEMPTS = 3  # a chunk needs this many keystrokes before it can count as a hot spot
+MODES = ("practice", "real")
+SUMMARY_FILE = "summary.npz"
+KEEP_LOGS = 200  # newest logs kept as they are - older ones get rolled into the summary
+STAMP = "%Y%m%d-%H%M%S"  # log names start with when the game started, so they sort oldest first
+
+_numbers = itertools.count()  # keeps log file names unique within this process
+_compact_lock = threading.Lock()  # one compaction (and analysis of the directory) at a time
+
+
+class KeystrokeLog:
+    def __init__(self, directory=LOG_DIR):
+        self.directory = directory
+        self.mode = None
+        self.offset = 0
+        self.started = 0.0
+        self.path = None
+        self.written = 0  # keystrokes already flushed for this game
+        self._last_ns = None
+        # One array per field keeps the buffer compact - no per-keystroke objects
+        self.positions = array.array("I")
+        self.digits = array.array("B")
+        self.correct = array.array("B")
+        self.deltas = array.array("I")
+
+    def __len__(self):
+        return self.written + len(self.positions)
+
+    # Start logging a new game - whatever the previous game logged gets flushed first
+    def start(self, mode, offset=0):
+        self.finish()
+        self.mode = mode
+        self.offset = offset
+        self.started = time.time()
+        self.path = None
+        self.written = 0
+        self._last_ns = time.monotonic_ns()
+
+    # Check the digit before touching the buffer - a bad call must not leave the four arrays out of step
+    def record(self, position, digit, correct):
+        if len(digit) != 1 or digit not in "0123456789":
+            raise ValueError(f"not a digit: {digit!r}")
+        now = time.monotonic_ns()
+        delta = (now - self._last_ns) // 1000 if self._last_ns is not None else 0
+        self._last_ns = now
+        self.positions.append(position)
+        self.digits.append(ord(digit) - 48)
+        self.correct.append(1 if correct else 0)
+        self.deltas.append(min(delta, 0xFFFFFFFF))
+        if len(self.positions) >= FLUSH_EVERY:
+            self.flush()
+
+    # Write the buffered keystrokes to this game's file (created on the first flush)
+    def flush(self):
+        if not self.positions or self.mode is None:
+            return
+        if self.path is None:
+            os.makedirs(self.directory, exist_ok=True)
+            stamp = datetime.fromtimestamp(self.started).strftime(STAMP)
+            for _ in range(1000):
+                # "x" mode never overwrites - two games started in the same second just get different numbers
+                path = os.path.join(self.directory, f"{stamp}-{self.mode}-{os.getpid()}-{next(_numbers)}.pik")
+                try:
+                    with open(path, "xb") as f:
+                        f.write(HEADER.pack(MAGIC, MODES.index(self.mode), self.started, self.offset))
+                    break
+                except FileExistsError:
+                    continue
+            else:
+                raise FileExistsError(f"too many keystroke logs for {stamp} in {self.directory}")
+            self.path = path
+        with open(self.path, "ab") as f:
+            f.write(b"".join(RECORD.pack(*fields) for fields in zip(self.positions, self.digits, self.correct, self.deltas)))
+        self.written += len(self.positions)
+        del self.positions[:], self.digits[:], self.correct[:], self.deltas[:]
+
+    # Flush and stop logging the current game
+    def finish(self):
+        self.flush()
+        self.mode = None
+
+
+# Names of the logs in the directory, oldest first - only the ones after `after` (the summary's last log)
+def log_names(directory=LOG_DIR, after=""):
+    if not os.path.isdir(directory):
+        return []
+    return sorted(name for name in os.listdir(directory) if name.endswith(".pik") and name > after)
+
+
+# Memory-map the logs in the directory one at a time as numpy record arrays - skips files that aren't ours
+def iter_logs(directory=LOG_DIR, names=None):
+    import numpy as np
+
+    dtype = np.dtype([("position", "<u4"), ("digit", "u1"), ("correct", "u1"), ("delta_us", "<u4")])
+    for name in log_names(directory) if names is None else names:
+        path = os.path.join(directory, name)
+        if os.path.getsize(path) < HEADER.size + RECORD.size:
+            continue
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                continue
+        count = (os.path.getsize(path) - HEADER.size) // RECORD.size
+        yield np.memmap(path, dtype=dtype, mode="r", offset=HEADER.size, shape=(count,))
+
+
+# Fold logs into running per-position totals (attempts, errors, hesitation in us, sessions) - one log at a time,
+# each is let go before the next is mapped. Starts from `totals` (e.g. the summary) if given
+def fold(logs, totals=None):
+    import numpy as np
+
+    attempts, errors, hesitation, sessions = totals or (np.zeros(0), np.zeros(0), np.zeros(0), 0)
+    for log in logs:
+        positions = log["position"]
+        length = int(positions.max()) + 1
+        if length > len(attempts):
+            grow = length - len(attempts)
+            attempts, errors, hesitation = (np.pad(a, (0, grow)) for a in (attempts, errors, hesitation))
+        attempts[:length] += np.bincount(positions, minlength=length)
+        errors[:length] += np.bincount(positions, weights=(log["correct"] == 0).astype(np.float64), minlength=length)
+        hesitation[:length] += np.bincount(positions, weights=log["delta_us"].astype(np.float64), minlength=length)
+        sessions += 1
+    return attempts, errors, hesitation, sessions
+
+
+# The summary's totals and the name of the last log rolled into it - empty totals and "" if there's no summary
+def load_summary(directory=LOG_DIR):
+    import numpy as np
+
+    path = os.path.join(directory, SUMMARY_FILE)
+    if not os.path.exists(path):
+        return None, ""
+    with np.load(path) as data:
+        return (data["attempts"], data["errors"], data["hesitation"], int(data["sessions"])), str(data["through"])
+
+
+# Roll all but the newest `keep` logs into the summary and delete them - returns how many were rolled up
+def compact(directory=LOG_DIR, keep=KEEP_LOGS):
+    import numpy as np
+
+    with _compact_lock:
+        totals, through = load_summary(directory)
+        names = log_names(directory, through)
+        # Logs from this second stay put - one started later in the same second could sort before them
+        now = datetime.now().strftime(STAMP)
+        old = [name for name in names[:max(0, len(names) - keep)] if name < now]
+        if not old:
+            return 0
+        attempts, errors, hesitation, sessions = fold(iter_logs(directory, old), totals)
+        tmp_path = os.path.join(directory, SUMMARY_FILE + ".tmp")
+        with open(tmp_path, "wb") as f:
+            np.savez(f, attempts=attempts, errors=errors, hesitation=hesitation, sessions=sessions, through=old[-1])
+        os.replace(tmp_path, os.path.join(directory, SUMMARY_FILE))
+        # Counted now - the summary skips these by name even if one can't be deleted
+        for name in old:
+            try:
+                os.remove(os.path.join(directory, name))
+            except OSError:
+                pass
+        return len(old)
+
+
+# Per-position and per-chunk stats across every session
+# Returns None without any logs, otherwise a dict with numpy arrays indexed by digit position (attempts, errors,
+# error_rate, hesitation_ms) and "chunks": [(first position, error rate, mean ms per key, keys), ...] hardest first
+def analyze(logs, top=10, totals=None):
+    import numpy as np
+
+    attempts, errors, hesitation, sessions = fold(logs, totals)
+    if not sessions:
+        return None
+
+    seen = attempts > 0
+    error_rate = np.divide(errors, attempts, out=np.zeros_like(errors), where=seen)
+    hesitation_ms = np.divide(hesitation, attempts * 1000, out=np.zeros_like(hesitation), where=seen)
+
+    # Roll positions up into 10 digit chunks (0-9, 10-19, ...) and rank by error rate, then hesitation
+    chunks = (len(attempts) + CHUNK - 1) // CHUNK
+    pad = chunks * CHUNK - len(attempts)
+    chunk_attempts, chunk_errors, chunk_hesitation = (np.pad(a, (0, pad)).reshape(chunks, CHUNK).sum(axis=1)
+                                                      for a in (attempts, errors, hesitation))
+    counted = (chunk_attempts >= MIN_ATTEMPTS) & (chunk_errors > 0)
+    chunk_rate = np.divide(chunk_errors, chunk_attempts, out=np.zeros(chunks), where=counted)
+    chunk_ms = np.divide(chunk_hesitation, chunk_attempts * 1000, out=np.zeros(chunks), where=counted)
+    order = np.lexsort((-chunk_ms, -chunk_rate))[:min(top, int(counted.sum()))]
+    hardest = [(int(i) * CHUNK, float(chunk_rate[i]), float(chunk_ms[i]), int(chunk_attempts[i])) for i in order]
+
+    return {
+        "sessions": sessions,
+        "keystrokes": int(attempts.sum()),
+        "attempts": attempts,
+        "errors": errors,
+        "error_rate": error_rate,
+        "hesitation_ms": hesitation_ms,
+        "chunks": hardest,
+    }
+
+
+# Stats for everything in a log directory - compacts it first, so this only ever reads the summary and the
+# newest KEEP_LOGS logs however long the history gets
+def analyze_dir(directory=LOG_DIR, top=10, keep=KEEP_LOGS):
+    compact(directory, keep)
+    with _compact_lock:
+        totals, through = load_summary(directory)
+        return analyze(iter_logs(directory, log_names(directory, through)), top, totals)
+
+
+# Hot spots for Practice Mode - {first position of a chunk: error rate}, empty without numpy or logs
+def hot_spots(directory=LOG_DIR, top=10):
+    try:
+        stats = analyze_dir(directory, top)
+    except ImportError:
+        return {}
+    if stats is None:
+        return {}
+    return {start: rate for start, rate, _, _ in stats["chunks"]}
+
+
+# Write `sessions` fake practice logs that keep stumbling on a few chunks, then time the analysis
+def bench(sessions=2000, depth=300, seed=314):
+    rng = random.Random(seed)
+    tricky = set(rng.sample(range(0, depth, CHUNK), 5))
+    with tempfile.TemporaryDirectory() as directory:
+        started = time.perf_counter()
+        for _ in range(sessions):
+            log = KeystrokeLog(directory)
+            log.start("practice")
+            for position in range(rng.randint(depth // 2, depth)):
+                miss = 0.15 if position - position % CHUNK in tricky else 0.01
+                while rng.random() < miss:
+                    log.record(position, "0", False)
+                log.record(position, "1", True)
+            log.finish()
+        written = time.perf_counter() - started
+
+        started = time.perf_counter()
+        stats = analyze(iter_logs(directory))
+        elapsed = time.perf_counter() - started
+
+        # Then the way the game does it - roll the old logs into the summary once, after that only the summary
+        # and the newest KEEP_LOGS logs are read (logs from the current second are never compacted, so wait one out)
+        time.sleep(1)
+        started = time.perf_counter()
+        analyze_dir(directory)
+        compacted = time.perf_counter() - started
+        started = time.perf_counter()
+        summarized = analyze_dir(directory)
+        steady = time.perf_counter() - started
+    print(f"wrote {sessions:,} sessions in {written:.2f}s, analyzed {stats['keystrokes']:,} keystrokes in "
+          f"{elapsed * 1000:.1f} ms")
+    print(f"compacted to a summary + {KEEP_LOGS} logs in {compacted * 1000:.1f} ms, analyzed from there in "
+          f"{steady * 1000:.1f} ms ({'same' if summarized['chunks'] == stats['chunks'] else 'DIFFERENT'} hot spots)")
+    found = {start for start, _, _, _ in stats["chunks"][:len(tricky)]}
+    print(f"planted tricky chunks {sorted(tricky)}, found {sorted(found)}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analyze Pi Memory Game keystroke logs")
+    parser.add_argument("--dir", default=LOG_DIR, help="log directory (default: keylogs)")
+    parser.add_argument("--bench", action="store_true", help="time the analysis over synthetic sessions")
+    args = parser.parse_args(argv)
+
+    if args.bench:
+        bench()
+        return
+    stats = analyze_dir(args.dir)
+    if stats is None:
+        print(f"No keystroke logs in {args.dir} yet - play a few games first")
+        return
+    print(f"{stats['sessions']:,} session(s), {stats['keystrokes']:,} keystrokes")
+    print("Hardest 10 digit chunks:")
+    for start, rate, ms, attempts in stats["chunks"]:
+        print(f"  digits {start + 1:>6,}-{start + CHUNK:<6,} {rate:6.1%} wrong, {ms:7.0f} ms per digit ({attempts} keys)")
+
+
+if __name__ == "__main__":
+    main()
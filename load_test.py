@@ -0,0 +1,143 @@
+# Load generator for the Pi Memory Game server
+# Opens lots of sessions against pi_server.py at once - every session connects, starts a practice game, types a
+# short recitation (with the odd wrong digit) one keystroke at a time, waiting for each answer, then quits.
+# Reports how many sessions/second got through and the keystroke round-trip latency percentiles.
+#
+# By default it starts its own server (on a free port, with a throwaway score database) so the real scores.db
+# is left alone. Point it at a running server with --connect host:port instead.
+#
+# Usage:
+#   python load_test.py                             # 100, 1,000 and 10,000 concurrent sessions
+#   python load_test.py --sessions 500 --keys 50
+#   python load_test.py --connect 192.168.1.20:3141
+
+import argparse
+import asyncio
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+
+from digit_source import load_digit_source
+from instrumentation import LatencyHistogram
+from replay import synthetic_stream
+
+LEVELS = (100, 1_000, 10_000)
+CONNECT_AT_ONCE = 256  # connections opened in parallel - more than this just overflows the listen backlog
+
+
+# Let this process open one socket per session
+def raise_file_limit(sessions):
+    try:
+        import resource
+    except ImportError:
+        return  # Windows
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    wanted = sessions + 64
+    if soft != resource.RLIM_INFINITY and soft < wanted:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (min(wanted, hard) if hard != resource.RLIM_INFINITY else wanted, hard))
+
+
+# One player - connect, wait for everyone else to connect, play, quit. Each keystroke's round trip is recorded
+async def session(host, port, keys, connect_slots, arrived, go, rtt):
+    try:
+        async with connect_slots:
+            reader, writer = await asyncio.open_connection(host, port)
+    finally:
+        arrived()
+    await go.wait()
+    writer.write(b"START practice\n")
+    await writer.drain()
+    await reader.readline()
+    for key in keys:
+        started = time.perf_counter_ns()
+        writer.write(b"K " + key + b"\n")
+        await writer.drain()
+        if not await reader.readline():
+            raise ConnectionError("server hung up")
+        rtt.record(time.perf_counter_ns() - started)
+    writer.write(b"QUIT\n")
+    await writer.drain()
+    await reader.readline()
+    writer.close()
+    await writer.wait_closed()
+
+
+# Run `sessions` players at the same time - returns (connect seconds, play seconds, failures, histogram)
+async def run_level(host, port, sessions, keys):
+    connect_slots = asyncio.Semaphore(CONNECT_AT_ONCE)
+    go = asyncio.Event()
+    all_connected = asyncio.Event()
+    rtt = LatencyHistogram()
+    count = 0
+
+    # Every session checks in once it's connected (or failed to) - nobody starts typing until they all have
+    def arrived():
+        nonlocal count
+        count += 1
+        if count == sessions:
+            all_connected.set()
+
+    started = time.perf_counter()
+    tasks = [asyncio.create_task(session(host, port, keys, connect_slots, arrived, go, rtt)) for _ in range(sessions)]
+    await all_connected.wait()
+    connected = time.perf_counter()
+    go.set()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    finished = time.perf_counter()
+    failures = sum(1 for result in results if isinstance(result, BaseException))
+    return connected - started, finished - connected, failures, rtt
+
+
+# Start pi_server.py on a free port with a throwaway database - returns (process, port)
+def start_server(db_path):
+    process = subprocess.Popen([sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "pi_server.py"),
+                                "--port", "0", "--db", db_path], stdout=subprocess.PIPE, text=True)
+    for line in process.stdout:  # skip anything printed before (like the old score file import)
+        if line.startswith("Listening on"):
+            return process, int(line.rsplit(":", 1)[1])
+    process.kill()
+    raise RuntimeError("server didn't start")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the Pi Memory Game server")
+    parser.add_argument("--connect", help="host:port of a running server (default: start one)")
+    parser.add_argument("--sessions", type=int, action="append", help="concurrent sessions (repeatable, default: 100, 1000, 10000)")
+    parser.add_argument("--keys", type=int, default=20, help="keystrokes per session (default: 20)")
+    args = parser.parse_args(argv)
+
+    levels = args.sessions or LEVELS
+    raise_file_limit(max(levels))
+    keys = [key.encode("ascii") for key in synthetic_stream(load_digit_source(), args.keys, error_rate=0.05)][:args.keys]
+
+    process = None
+    tmp_dir = None
+    if args.connect:
+        host, port = args.connect.rsplit(":", 1)
+        port = int(port)
+    else:
+        tmp_dir = tempfile.TemporaryDirectory()
+        process, port = start_server(os.path.join(tmp_dir.name, "load_test.db"))
+        host = "127.0.0.1"
+
+    try:
+        print(f"{'sessions':>9}{'connect s':>11}{'sessions/s':>12}{'keys/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'failed':>8}")
+        for sessions in levels:
+            connect_time, play_time, failures, rtt = asyncio.run(run_level(host, port, sessions, keys))
+            done = sessions - failures
+            print(f"{sessions:>9,}{connect_time:>11.2f}{done / (connect_time + play_time):>12,.0f}"
+                  f"{rtt.total / play_time:>10,.0f}{rtt.percentile(0.5) / 1e6:>9.2f}{rtt.percentile(0.95) / 1e6:>9.2f}"
+                  f"{rtt.percentile(0.99) / 1e6:>9.2f}{failures:>8}")
+    finally:
+        if process is not None:
+            # Ctrl+C lets the server flush its score database before it exits
+            process.send_signal(signal.SIGINT if os.name != "nt" else signal.SIGTERM)
+            process.wait()
+            tmp_dir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
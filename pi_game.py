@@ -4,67 +4,76 @@
 
 import tkinter as tk
 from tkinter import messagebox
-import os
-from datetime import datetime
-import matplotlib.pyplot as plt
-import pandas as pd
-import winsound
+import threading
+import audio
+from engine import PiEngine
+from instrumentation import DebugOverlay, LatencyRecorder
+from keylog import KeystrokeLog
+from digit_manifest import CorruptDigitsError
+from digit_source import load_digit_source
+from score_export import ScoreExporter
+from score_db import ScoreDB
+from screen_manager import ScreenManager
+from virtual_list import VirtualList
 
 class PiGame:
     # Initialize the game window, set up the UI, and load saved scores
     # Set up the main window with a fixed size and a light blue background
-    def __init__(self, root):
+    def __init__(self, root, latency=None, audio_backend="auto"):
         self.root = root
         self.root.title("Pi Memory Game")
         self.root.geometry("400x600")
         self.root.configure(bg="#E6F0FA")
 
-        # Lists to keep track of widgets for each screen
-        self.main_menu_widgets = []
-        self.practice_mode_widgets = []
-        self.instructions_widgets = []
-        self.real_game_widgets = []
-        self.progress_widgets = []
-
-        # A string of the first 500 digits of pi - note im willing to add more if ever needed!
-        self.pi_digits = ("3.1415926535897932384626433832795028841971693993751058209749445923078164062862089986280348253421170679 "
-                          "8214808651328230664709384460955058223172535940812848111745028410270193852110555964462294885493038196 "
-                          "4428810975665933446128475648233786783165271201909145648566923460348610454326648213393607260249141273 "
-                          "7245870066063155881748815209209628292540917153643678925903600113305305488204665213841469519415116094 "
-                          "3305727036575959195309218611738193261179310511854807446237996274956735188575272489122793818301194912")
-        self.pi_digits = self.pi_digits.replace(" ", "")  # Remove spaces for easier indexing
-
-        # Game state variables
-        self.user_input = ""  # Tracks the digits the player has entered
-        self.game_active = True  # Controls whether the game is ongoing
-        self.wrong_guesses = 0  # Counts mistakes in Real Game mode
-        self.show_hint = False  # Toggles hint display in Practice Mode
+        # Per-keystroke latency histograms - press F12 to show them on top of the window
+        self.latency = latency or LatencyRecorder()
+        self.debug_overlay = DebugOverlay(self.root, self.latency)
+        self.root.bind_all("<F12>", self.debug_overlay.toggle)
+
+        # A damaged digit file is only noticed when a bad chunk is first read - that can happen in any callback
+        self.root.report_callback_exception = self.report_callback_error
+
+        # Sounds play on a worker thread - the backend is picked (and imported) the first time one plays
+        self.audio = audio.AudioPlayer(audio_backend, root=self.root)
+
+        # Each screen is built once and reused - switching screens just hides one frame and shows another
+        self.screens = ScreenManager(self.root, bg="#E6F0FA")
+        self.screens.register("menu", self.build_main_menu, self.refresh_main_menu)
+        self.screens.register("instructions", self.build_instructions)
+        self.screens.register("progress", self.build_progress, self.refresh_progress)
+        self.screens.register("graph", self.build_graph, self.refresh_graph)
+        self.screens.register("practice", self.build_practice, self.refresh_practice)
+        self.screens.register("real", self.build_real_game, self.refresh_real_game)
+        self.screens.register("search", self.build_search, self.refresh_search)
+        self.screens.register("verify", self.build_verify)
+        self.screens.register("hot_spots", self.build_hot_spots, self.refresh_hot_spots)
+
+        # The digits of pi come from a memory-mapped digit store (pi_digits.bin) so we can go way past 500
+        # Index 0 is the first digit after "3." - see digit_source.py
+        self.digits = load_digit_source()
+
+        # UI state variables
         self.pi_display = None  # Reference to the label showing Pi digits
         self.current_mode = "menu"  # Tracks which screen/mode we're in
 
-        # Load the all-time high score from a file
-        self.high_score_file = "high_score.txt"
-        if os.path.exists(self.high_score_file):
-            with open(self.high_score_file, "r") as f:
-                try:
-                    self.high_score = int(f.read().strip())
-                except ValueError:
-                    self.high_score = 0  # Default to 0 if the file is corrupted
-        else:
-            self.high_score = 0
-
-        # Load daily scores into a dictionary for progress tracking
-        self.daily_scores_file = "daily_scores.txt"
-        self.daily_scores = {}
-        if os.path.exists(self.daily_scores_file):
-            with open(self.daily_scores_file, "r") as f:
-                for line in f:
-                    try:
-                        date, score = line.strip().split(":")
-                        self.daily_scores[date] = int(score)
-                    except ValueError:
-                        continue  # Skip malformed lines
-        print(f"Loaded daily scores: {self.daily_scores}")  # Debug to confirm loading
+        # Every game is saved to a SQLite history (scores.db) - screens query just what they show, and new results
+        # are written on a background thread so the window never waits on the disk
+        self.scores = ScoreDB(recorder=self.latency)
+
+        self.exporter = None  # created the first time someone exports
+
+        # The game rules and state live in the engine - this class just draws what it tells us to
+        # Every keystroke is logged (keylogs/, one small binary file per game) - the analysis of those logs finds
+        # the player's tricky spots, which Practice Mode then warns about
+        self.keylog = KeystrokeLog()
+        self.engine = PiEngine(self.digits, high_score=self.scores.high_score(), log=self.keylog)
+        self.hot_spots_loaded = False
+        self.hot_spot_rows = []
+        self.practice_offset = 0  # where the next practice game starts - set by the search screen
+        self.digit_index = None  # sequence search index, opened (on a worker thread) the first time someone searches
+        self.digit_index_state = None  # None until the first search, then "loading" and "ready"
+        self.search_results = []
+        self.search_sequence = ""
 
         # Start the game by showing the main menu
         self.create_main_menu()
@@ -72,79 +81,121 @@ class PiGame:
     # Bind keyboard events to the pi_display widget for digit input - I want the user to be able to click the calculator or type digits
     def bind_keys(self):
         if self.pi_display:
-            self.pi_display.unbind("<Key>")
-            self.pi_display.bind("<Key>", self.key_press)
-            self.pi_display.focus_set()
-            self.root.update()
-            self.root.update_idletasks()
+            with self.latency.phase("bind"):
+                self.pi_display.unbind("<Key>")
+                self.pi_display.bind("<Key>", self.key_press)
+                self.pi_display.focus_set()
+                self.root.update()
+                self.root.update_idletasks()
 
     # Unbind keyboard events when leaving a game mode
     def unbind_keys(self):
         if self.pi_display:
             self.pi_display.unbind("<Key>")
 
-    # Save the all-time high score to a file
-    def save_high_score(self):
-        with open(self.high_score_file, "w") as f:
-            f.write(str(self.high_score))
+    # Sound effect - one buzz for a wrong guess, a double buzz for game over (queued, never waits for the sound)
+    def play_buzzer(self, buzzes=1):
+        with self.latency.phase("audio"):
+            self.audio.play("game_over" if buzzes > 1 else "buzzer")
 
-    # Save daily scores to a file for persistence tracking purposes
-    def save_daily_scores(self):
-        with open(self.daily_scores_file, "w") as f:
-            for date, score in self.daily_scores.items():
-                f.write(f"{date}:{score}\n")
-        print(f"Saved daily scores: {self.daily_scores}")
+    # Tell the player the digit file is damaged (and exactly where) instead of marking correct digits wrong
+    def report_callback_error(self, exc_type, error, traceback):
+        if not isinstance(error, CorruptDigitsError):
+            tk.Tk.report_callback_exception(self.root, exc_type, error, traceback)
+            return
+        messagebox.showerror("Damaged Digit File", f"The pi digit file is damaged - {error}.\n\n"
+                                                   f"Check the whole file with: python digit_manifest.py")
+        self.create_main_menu()
 
-    # Sound effect to play a short buzzer sound
-    def play_buzzer(self):
-        winsound.Beep(400, 300)
+    # Run work() on a worker thread and hand its result to done() back on the Tk thread (or call failed() if it raised)
+    # The thread never touches a widget - the Tk loop polls for it like the score export does
+    def run_in_background(self, name, work, done, failed=None):
+        result = {}
+
+        def target():
+            try:
+                result["value"] = work()
+            except Exception as error:
+                result["error"] = error
+
+        thread = threading.Thread(target=target, name=name, daemon=True)
+        thread.start()
+
+        def poll():
+            if thread.is_alive():
+                self.root.after(50, poll)
+            elif "error" in result:
+                if failed:
+                    failed()
+                raise result["error"]  # shown by report_callback_error like any other callback error
+            else:
+                done(result["value"])
+        self.root.after(50, poll)
+
+    # Switch to another screen - stop listening for keys on the old one first
+    def show_screen(self, name):
+        if self.screens.current == "practice":
+            self.save_practice()
+        self.keylog.finish()  # write out the keystrokes of the game we're leaving
+        self.unbind_keys()
+        self.pi_display = None
+        self.screens.show(name)
 
-    # Create the main menu screen with buttons to navigate to other modes
+    # Show the main menu screen with buttons to navigate to other modes
     def create_main_menu(self):
-        self.clear_screen()  # Clear any existing widgets
         self.current_mode = "menu"
+        self.show_screen("menu")
 
+    # Build the main menu widgets once - only the high score label changes after that
+    def build_main_menu(self, frame):
         # Title label for the game
-        self.label = tk.Label(self.root, text="Pi Memory Game", font=("Arial", 20, "bold"), bg="#E6F0FA")
+        self.label = tk.Label(frame, text="Pi Memory Game", font=("Arial", 20, "bold"), bg="#E6F0FA")
         self.label.pack(pady=20, anchor="center")
-        self.main_menu_widgets.append(self.label)
 
         # Show the all-time high score
-        self.score_label = tk.Label(self.root, text=f"All-Time High Score: {self.high_score}", font=("Arial", 12), bg="#E6F0FA")
+        self.score_label = tk.Label(frame, text=f"All-Time High Score: {self.engine.high_score}", font=("Arial", 12), bg="#E6F0FA")
         self.score_label.pack(pady=5, anchor="center")
-        self.main_menu_widgets.append(self.score_label)
 
         # Buttons to navigate to different modes
         # How to Play - detailed instructions on how to play the game and how the gamemodes work
-        self.how_to_play_button = tk.Button(self.root, text="How to Play", font=("Arial", 14), width=15, command=self.show_instructions, bg="#F5F5DC", fg="black", relief="raised")
-        self.how_to_play_button.pack(pady=10)
-        self.main_menu_widgets.append(self.how_to_play_button)
+        self.how_to_play_button = tk.Button(frame, text="How to Play", font=("Arial", 14), width=15, command=self.show_instructions, bg="#F5F5DC", fg="black", relief="raised")
+        self.how_to_play_button.pack(pady=7)
 
         # Practice Game - way to practice learning pi - mode tells you when you egt one wrong and displays next correct digits to promote learning (this method helped me learn so many digits)
-        self.practice_button = tk.Button(self.root, text="Practice Game", font=("Arial", 14), width=15, command=self.start_practice, bg="#F5F5DC", fg="black", relief="raised")
-        self.practice_button.pack(pady=10)
-        self.main_menu_widgets.append(self.practice_button)
+        self.practice_button = tk.Button(frame, text="Practice Game", font=("Arial", 14), width=15, command=self.start_practice, bg="#F5F5DC", fg="black", relief="raised")
+        self.practice_button.pack(pady=7)
 
         # Real Game - mode to test yourself. Keep going until you get 3 wrong. Then it tells you the next digits so you can keep tyesting and improving
-        self.real_game_button = tk.Button(self.root, text="Real Game", font=("Arial", 14), width=15, command=self.start_real_game, bg="#F5F5DC", fg="black", relief="raised")
-        self.real_game_button.pack(pady=10)
-        self.main_menu_widgets.append(self.real_game_button)
+        self.real_game_button = tk.Button(frame, text="Real Game", font=("Arial", 14), width=15, command=self.start_real_game, bg="#F5F5DC", fg="black", relief="raised")
+        self.real_game_button.pack(pady=7)
 
         # View Progress  - view your progress over time and have the ability to view your scores by day
-        self.progress_button = tk.Button(self.root, text="View Progress", font=("Arial", 14), width=15, command=self.show_progress, bg="#F5F5DC", fg="black", relief="raised")
-        self.progress_button.pack(pady=10)
-        self.main_menu_widgets.append(self.progress_button)
+        self.progress_button = tk.Button(frame, text="View Progress", font=("Arial", 14), width=15, command=self.show_progress, bg="#F5F5DC", fg="black", relief="raised")
+        self.progress_button.pack(pady=7)
 
         # Progress Graph - view a graph of progress over time for the data people like me who find it interesting
-        self.graph_button = tk.Button(self.root, text="Progress Graph", font=("Arial", 14), width=15, command=self.show_progress_graph, bg="#F5F5DC", fg="black", relief="raised")
-        self.graph_button.pack(pady=10)
-        self.main_menu_widgets.append(self.graph_button)
+        self.graph_button = tk.Button(frame, text="Progress Graph", font=("Arial", 14), width=15, command=self.show_progress_graph, bg="#F5F5DC", fg="black", relief="raised")
+        self.graph_button.pack(pady=7)
+
+        # Find in Pi - look up where a birthday or phone number shows up in pi and practice from there
+        self.search_button = tk.Button(frame, text="Find in Pi", font=("Arial", 14), width=15, command=self.show_search, bg="#F5F5DC", fg="black", relief="raised")
+        self.search_button.pack(pady=7)
+
+        # Verify Recitation - paste or load a whole recitation (record attempts!) and check it in one go
+        self.verify_button = tk.Button(frame, text="Verify Recitation", font=("Arial", 14), width=15, command=self.show_verify, bg="#F5F5DC", fg="black", relief="raised")
+        self.verify_button.pack(pady=7)
+
+    # Keep the high score on the menu up to date
+    def refresh_main_menu(self):
+        self.score_label.config(text=f"All-Time High Score: {self.engine.high_score}")
 
     # Display the game instructions and some fun facts about Pi
     def show_instructions(self):
-        self.clear_screen()
         self.current_mode = "menu"
+        self.show_screen("instructions")
 
+    # Build the instructions screen - it never changes so this only runs once
+    def build_instructions(self, frame):
         # Instructions text with rules and Pi facts
         instructions_text = (
             "Welcome to the Pi Memory Game! \n\n"
@@ -160,125 +211,366 @@ class PiGame:
             "- Pi is often calculated using the Chudnovsky algorithm, a formula involving factorials and square roots.\n"
         )
         # Instructions label
-        self.instructions_label = tk.Label(self.root, text=instructions_text, font=("Arial", 12), wraplength=350, justify="left", bg="#E6F0FA")
+        self.instructions_label = tk.Label(frame, text=instructions_text, font=("Arial", 12), wraplength=350, justify="left", bg="#E6F0FA")
         self.instructions_label.pack(pady=20)
-        self.instructions_widgets.append(self.instructions_label)
 
         # Adding a back to menu button
-        self.back_button = tk.Button(self.root, text="Back to Menu", font=("Arial", 14), width=15, command=self.create_main_menu, bg="#F5F5DC", fg="black", relief="raised")
-        self.back_button.pack(pady=10, anchor="center")
-        self.instructions_widgets.append(self.back_button)
+        back_button = tk.Button(frame, text="Back to Menu", font=("Arial", 14), width=15, command=self.create_main_menu, bg="#F5F5DC", fg="black", relief="raised")
+        back_button.pack(pady=10, anchor="center")
 
     # Show the player's daily progress with stats and an export option
     def show_progress(self):
-        self.clear_screen()
         self.current_mode = "menu"
+        self.show_screen("progress")
 
+    # Build the progress screen once - the score list is virtualized so it only ever draws the rows on screen
+    def build_progress(self, frame):
         # Title for the progress screen
-        title = tk.Label(self.root, text="★ Your Pi Progress ★", font=("Arial", 16, "bold"), bg="#E6F0FA")
+        title = tk.Label(frame, text="★ Your Pi Progress ★", font=("Arial", 16, "bold"), bg="#E6F0FA")
         title.pack(pady=10, anchor="center")
-        self.progress_widgets.append(title)
 
         # Explanation of what the screen does
-        blip = tk.Label(self.root, text="Here’s a dictionary to track your daily high scores!", font=("Arial", 10, "italic"), bg="#E6F0FA")
+        blip = tk.Label(frame, text="Here’s a dictionary to track your daily high scores!", font=("Arial", 10, "italic"), bg="#E6F0FA")
         blip.pack(pady=5, anchor="center")
-        self.progress_widgets.append(blip)
 
-        # Check if there are any scores to display
-        if not self.daily_scores:
-            no_data = tk.Label(self.root, text="No scores yet! Play to start tracking~", font=("Arial", 12), bg="#E6F0FA")
-            no_data.pack(pady=20)
-            self.progress_widgets.append(no_data)
-        else:
-            # Create a frame to hold the score entries
-            scores_frame = tk.Frame(self.root, bg="#E6F0FA")
-            scores_frame.pack(pady=10)
-            self.progress_widgets.append(scores_frame)
-
-            # Display each score entry sorted by date (newest first)
-            for date, score in sorted(self.daily_scores.items(), reverse=True):
-                entry = tk.Label(scores_frame, text=f"★ {date} : {score} digits ★", font=("Arial", 12), bg="lightpink", width=30, relief="ridge")
-                entry.pack(pady=5)
-                self.progress_widgets.append(entry)
-
-            # Calculate and show some basic stats
-            scores = list(self.daily_scores.values())
-            avg_score = sum(scores) / len(scores) if scores else 0
-            best_day = max(self.daily_scores.items(), key=lambda x: x[1], default=("N/A", 0))
-            stats_label = tk.Label(self.root, text=f"Average Score: {avg_score:.1f} | Best Day: {best_day[0]} ({best_day[1]} digits)", font=("Arial", 10), bg="#E6F0FA")
-            stats_label.pack(pady=5, anchor="center")
-            self.progress_widgets.append(stats_label)
-
-            # Add a button to export scores to CSV
-            export_button = tk.Button(self.root, text="Export Scores", font=("Arial", 12), width=15, command=self.export_scores, bg="#F5F5DC", fg="black", relief="raised")
-            export_button.pack(pady=5)
-            self.progress_widgets.append(export_button)
+        # Shown instead of the list when there are no scores yet
+        self.progress_no_data = tk.Label(frame, text="No scores yet! Play to start tracking~", font=("Arial", 12), bg="#E6F0FA")
 
-        # Back button to return to the main menu
-        back_button = tk.Button(self.root, text="Back to Menu", font=("Arial", 14), width=15, command=self.create_main_menu, bg="#F5F5DC", fg="black", relief="raised")
-        back_button.pack(pady=10, anchor="center")
-        self.progress_widgets.append(back_button)
+        # Everything that needs scores lives in one frame so it can be swapped with the no data label
+        self.progress_body = tk.Frame(frame, bg="#E6F0FA")
 
-    # Plot the player's daily scores over time using matplotlib
+        # Date range paging - "All time" or one year at a time
+        range_frame = tk.Frame(self.progress_body, bg="#E6F0FA")
+        range_frame.pack(pady=5)
+        tk.Button(range_frame, text="◀", font=("Arial", 10), command=lambda: self.change_progress_range(1), bg="#F5F5DC").pack(side="left")
+        self.progress_range_label = tk.Label(range_frame, text="All time", font=("Arial", 11, "bold"), width=12, bg="#E6F0FA")
+        self.progress_range_label.pack(side="left", padx=5)
+        tk.Button(range_frame, text="▶", font=("Arial", 10), command=lambda: self.change_progress_range(-1), bg="#F5F5DC").pack(side="left")
+
+        # Score entries sorted by date (newest first) - only the visible rows are drawn
+        self.progress_list = VirtualList(self.progress_body, self.progress_row_text, visible_rows=8)
+        self.progress_list.pack(pady=5)
+
+        # Basic stats - read from the summary tables the database keeps up to date, so nothing gets recalculated here
+        self.progress_stats = tk.Label(self.progress_body, text="", font=("Arial", 10), bg="#E6F0FA")
+        self.progress_stats.pack(pady=5, anchor="center")
+
+        # Add a button to export scores to CSV
+        progress_buttons = tk.Frame(self.progress_body, bg="#E6F0FA")
+        progress_buttons.pack(pady=5)
+        self.export_button = tk.Button(progress_buttons, text="Export Scores", font=("Arial", 12), width=12, command=self.export_scores, bg="#F5F5DC", fg="black", relief="raised")
+        self.export_button.pack(side="left", padx=5)
+
+        # Tricky Spots - the 10 digit chunks you miss the most, worked out from the keystroke logs
+        tk.Button(progress_buttons, text="Tricky Spots", font=("Arial", 12), width=12, command=self.show_hot_spots, bg="#F5F5DC", fg="black", relief="raised").pack(side="left", padx=5)
+
+        # Back button to return to the main menu
+        self.progress_back = tk.Button(frame, text="Back to Menu", font=("Arial", 14), width=15, command=self.create_main_menu, bg="#F5F5DC", fg="black", relief="raised")
+        self.progress_back.pack(pady=10, anchor="center", side="bottom")
+        self.progress_ranges = [""]
+        self.progress_range_index = 0
+        self.progress_page = (0, [])  # (offset, rows) - the page of rows the list is currently drawing from
+
+    # Update the progress screen each time it's shown
+    def refresh_progress(self):
+        if not self.scores.day_count():
+            self.progress_body.pack_forget()
+            self.progress_no_data.pack(pady=20)
+            return
+        self.progress_no_data.pack_forget()
+        self.progress_body.pack(pady=5)
+
+        self.progress_ranges = [""] + self.scores.years()
+        self.progress_range_index = 0
+        self.show_progress_range()
+        stats = self.scores.stats()
+        best_date, best_score = stats["best_day"]
+        self.progress_stats.config(text=f"Average Score: {stats['average']:.1f} | Best Day: {best_date} ({best_score} digits)\n"
+                                        f"Median Day: {self.scores.percentile(50)} | Streak: {stats['current_streak']} "
+                                        f"day(s) (longest {stats['longest_streak']})")
+
+    # Step through the date ranges - direction 1 goes back in time, -1 forward
+    def change_progress_range(self, direction):
+        index = self.progress_range_index + direction
+        if 0 <= index < len(self.progress_ranges):
+            self.progress_range_index = index
+            self.show_progress_range()
+
+    # Point the list at the current date range - only the row count is queried here
+    def show_progress_range(self):
+        prefix = self.progress_ranges[self.progress_range_index]
+        self.progress_range_label.config(text=prefix or "All time")
+        self.progress_page = (0, [])
+        self.progress_list.set_count(self.scores.day_count(prefix))
+
+    # Text for one row of the list, newest date first - rows are fetched a page at a time as you scroll
+    def progress_row_text(self, index):
+        offset, rows = self.progress_page
+        if not offset <= index < offset + len(rows):
+            offset = index - index % 50
+            rows = self.scores.days(self.progress_ranges[self.progress_range_index], offset, 50)
+            self.progress_page = (offset, rows)
+        date, score = rows[index - offset]
+        return f"★ {date} : {score} digits ★"
+
+    # Show the progress graph inside the game window
     def show_progress_graph(self):
-        if not self.daily_scores:
+        if not self.scores.day_count():
             messagebox.showinfo("No Data", "No scores to plot yet! Play some games first.")
             return
+        # matplotlib is optional - check for it before leaving the current screen
+        try:
+            import analytics  # noqa: F401
+        except ImportError:
+            messagebox.showinfo("Graph Unavailable", "The progress graph needs matplotlib - pip install matplotlib")
+            return
+        self.current_mode = "menu"
+        self.show_screen("graph")
+
+    # Build the graph screen once - analytics (and matplotlib) only get imported the first time it's opened
+    def build_graph(self, frame):
+        import analytics
+        # Back button to return to the main menu
+        back_button = tk.Button(frame, text="Back to Menu", font=("Arial", 14), width=15, command=self.create_main_menu, bg="#F5F5DC", fg="black", relief="raised")
+        back_button.pack(pady=10, anchor="center", side="bottom")
+        self.progress_graph = analytics.ProgressGraph(frame, self.scores)
+
+    # Add any new scores to the graph each time it's shown
+    def refresh_graph(self):
+        self.progress_graph.update()
 
-        # Prepare data for plotting
-        dates = sorted(self.daily_scores.keys())
-        scores = [self.daily_scores[date] for date in dates]
-
-        # Create a line plot with markers
-        plt.figure(figsize=(9, 7))
-        plt.plot(dates, scores, marker="o", color="#0000FF", linestyle="-", linewidth=2, markersize=8)
-        # Add a label above each point
-        for i, score in enumerate(scores):
-            plt.text(dates[i], score + 1, str(score), ha='center', va='bottom', fontsize=12)
-        plt.title("Pi Memory Game Progress Over Time", fontsize=14)
-        plt.xlabel("Date", fontsize=12)
-        plt.ylabel("Score (Digits)", fontsize=12)
-        plt.xticks(rotation=45)
-        plt.grid(True, linestyle="--", alpha=0.7)
-        plt.tight_layout()
-        plt.show()
-
-    # Export daily scores to a CSV file
+    # Export daily scores to a CSV file - runs on a worker thread and only appends the days added since last time
     def export_scores(self):
-        if not self.daily_scores:
+        if not self.scores.day_count():
             messagebox.showinfo("No Data", "No scores to export yet!")
             return
+        if self.exporter is None:
+            self.exporter = ScoreExporter(self.root, self.scores, on_progress=self.export_progress, on_done=self.export_done)
+        if self.exporter.start():
+            self.export_button.config(state="disabled", text="Exporting...")
+
+    # Progress updates from the export thread (delivered on the Tk thread)
+    def export_progress(self, done, total):
+        self.export_button.config(text=f"Exporting {done * 100 // max(total, 1)}%")
+
+    def export_done(self, message):
+        self.export_button.config(state="normal", text="Export Scores")
+        title = "Export Failed" if message.startswith("Export failed") else "Success"
+        messagebox.showinfo(title, message)
+
+    # Show the "find my sequence in pi" screen
+    def show_search(self):
+        self.current_mode = "menu"
+        self.show_screen("search")
+
+    # Build the search screen once - results go in a virtualized list so thousands of matches cost nothing
+    def build_search(self, frame):
+        title = tk.Label(frame, text="Find in Pi", font=("Arial", 16, "bold"), bg="#E6F0FA")
+        title.pack(pady=10, anchor="center")
+
+        blip = tk.Label(frame, text="Type a birthday, phone number or any digits to see where they show up!", font=("Arial", 10, "italic"), wraplength=350, bg="#E6F0FA")
+        blip.pack(pady=5, anchor="center")
+
+        entry_frame = tk.Frame(frame, bg="#E6F0FA")
+        entry_frame.pack(pady=5)
+        self.search_entry = tk.Entry(entry_frame, font=("Arial", 14), width=14)
+        self.search_entry.pack(side="left", padx=5)
+        self.search_entry.bind("<Return>", lambda e: self.run_search())
+        tk.Button(entry_frame, text="Search", font=("Arial", 12), command=self.run_search, bg="#F5F5DC", fg="black", relief="raised").pack(side="left")
+
+        self.search_summary = tk.Label(frame, text="", font=("Arial", 11), wraplength=350, bg="#E6F0FA")
+        self.search_summary.pack(pady=5)
+
+        # Every match, in order - click one to practice from there
+        self.search_list = VirtualList(frame, self.search_row_text, visible_rows=6, width=340, font=("Arial", 10), on_click=self.practice_from_result)
+        self.search_list.pack(pady=5)
+
+        back_button = tk.Button(frame, text="Back to Menu", font=("Arial", 14), width=15, command=self.create_main_menu, bg="#F5F5DC", fg="black", relief="raised")
+        back_button.pack(pady=10, anchor="center", side="bottom")
+
+    def refresh_search(self):
+        self.search_entry.focus_set()
+
+    # Look the digits up in the index - shows up to 1000 matches
+    # pi_generator.py builds the index ahead of time; if it's missing it gets built on a worker thread and the
+    # search runs once it's ready
+    def run_search(self):
+        import digit_index
+
+        sequence = "".join(ch for ch in self.search_entry.get() if ch.isdigit())  # allow 03/14/1592 or 555-1234
+        if not sequence:
+            self.search_summary.config(text="Type some digits to search for")
+            return
+        if self.digit_index_state != "ready":
+            self.search_summary.config(text="Building the search index (only the first time)...")
+            if self.digit_index_state is None:
+                self.digit_index_state = "loading"
+                self.run_in_background("digit-index", lambda: digit_index.load_index(self.digits), self.search_index_ready,
+                                       failed=lambda: setattr(self, "digit_index_state", None))
+            return
+        if self.digit_index is not None:
+            self.search_results = self.digit_index.find_all(sequence)
+        else:
+            self.search_results = digit_index.scan_all(self.digits, sequence)  # too big to index here - scan it
+        self.search_sequence = sequence
 
-        # Convert the dictionary to a dataFrame and save as csv
-        df = pd.DataFrame(list(self.daily_scores.items()), columns=["Date", "Score"])
-        df.to_csv("scores_export.csv", index=False)
-        # Print the absolute path so the user knows where the file is saved
-        absolute_path = os.path.abspath("scores_export.csv")
-        print(f"Exported scores to: {absolute_path}")
-        messagebox.showinfo("Success", f"Scores exported to scores_export.csv!\nLocation: {absolute_path}")
+        if not self.search_results:
+            self.search_summary.config(text=f"{sequence} isn't in the first {len(self.digits):,} digits of pi")
+        else:
+            more = "+" if len(self.search_results) >= digit_index.MAX_RESULTS else ""
+            self.search_summary.config(text=f"{sequence} first shows up at digit {self.search_results[0] + 1:,} - "
+                                            f"found {len(self.search_results):,}{more} time(s). Click one to practice from there!")
+        self.search_list.set_count(len(self.search_results))
+
+    # The index is open (None if the digit file is too big to index here) - run the search that was waiting on it
+    def search_index_ready(self, index):
+        self.digit_index = index
+        self.digit_index_state = "ready"
+        self.run_search()
+
+    # Text for one match - where it is and the digits around it
+    def search_row_text(self, index):
+        position = self.search_results[index]
+        before = self.digits.digits(max(0, position - 3), position)
+        after = self.digits.digits(position + len(self.search_sequence), position + len(self.search_sequence) + 3)
+        return f"Digit {position + 1:,}: ...{before}[{self.search_sequence}]{after}..."
+
+    # Jump Practice Mode to a match
+    def practice_from_result(self, index):
+        self.practice_offset = self.search_results[index]
+        self.start_practice()
+
+    # Show the verify recitation screen
+    def show_verify(self):
+        self.current_mode = "menu"
+        self.show_screen("verify")
 
-    # Start practice mode where players can learn Pi digits with hints
-    def start_practice(self):
-        self.clear_screen()
-        self.user_input = ""
-        self.game_active = True
-        self.show_hint = False
-        self.current_mode = "practice"
+    # Build the verify screen once - a box to paste digits into, or load them from a file
+    def build_verify(self, frame):
+        title = tk.Label(frame, text="Verify Recitation", font=("Arial", 16, "bold"), bg="#E6F0FA")
+        title.pack(pady=10, anchor="center")
+
+        blip = tk.Label(frame, text="Paste a recitation (or load one from a file) to check every digit at once", font=("Arial", 10, "italic"), wraplength=350, bg="#E6F0FA")
+        blip.pack(pady=5, anchor="center")
+
+        self.verify_text = tk.Text(frame, font=("Arial", 11), width=40, height=8, wrap="char")
+        self.verify_text.pack(pady=5)
+
+        button_frame = tk.Frame(frame, bg="#E6F0FA")
+        button_frame.pack(pady=5)
+        tk.Button(button_frame, text="Check", font=("Arial", 12), width=10, command=self.run_verify, bg="#F5F5DC", fg="black", relief="raised").pack(side="left", padx=5)
+        tk.Button(button_frame, text="Load File...", font=("Arial", 12), width=10, command=self.load_recitation, bg="#F5F5DC", fg="black", relief="raised").pack(side="left", padx=5)
+
+        self.verify_result = tk.Label(frame, text="", font=("Arial", 11), wraplength=350, justify="left", bg="#E6F0FA")
+        self.verify_result.pack(pady=5)
+
+        back_button = tk.Button(frame, text="Back to Menu", font=("Arial", 14), width=15, command=self.create_main_menu, bg="#F5F5DC", fg="black", relief="raised")
+        back_button.pack(pady=10, anchor="center", side="bottom")
+
+    # Check whatever is in the text box
+    def run_verify(self):
+        self.show_verification(self.verify_text.get("1.0", "end"))
+
+    # Check a recitation file - it's not put in the text box since it could be a million digits long
+    def load_recitation(self):
+        from tkinter import filedialog
 
+        path = filedialog.askopenfilename(title="Load recitation", filetypes=[("Text files", "*.txt"), ("All files", "*")])
+        if not path:
+            return
+        try:
+            with open(path, "rb") as f:
+                transcript = f.read()
+        except OSError as error:
+            messagebox.showinfo("Load Failed", f"Could not read {path}:\n{error}")
+            return
+        self.show_verification(transcript)
+
+    def show_verification(self, transcript):
+        import verify
+
+        result = verify.verify(self.digits, transcript)
+        self.verify_result.config(text=verify.summary(result, self.digits))
+
+    # Show the tricky spots screen
+    def show_hot_spots(self):
+        self.current_mode = "menu"
+        self.show_screen("hot_spots")
+
+    # Build the tricky spots screen once - click a chunk to practice it
+    def build_hot_spots(self, frame):
+        title = tk.Label(frame, text="Your Tricky Spots", font=("Arial", 16, "bold"), bg="#E6F0FA")
+        title.pack(pady=10, anchor="center")
+
+        self.hot_spots_summary = tk.Label(frame, text="", font=("Arial", 10, "italic"), wraplength=350, bg="#E6F0FA")
+        self.hot_spots_summary.pack(pady=5, anchor="center")
+
+        self.hot_spots_list = VirtualList(frame, self.hot_spot_text, visible_rows=10, width=340, font=("Arial", 10), on_click=self.practice_hot_spot)
+        self.hot_spots_list.pack(pady=5)
+
+        back_button = tk.Button(frame, text="Back to Progress", font=("Arial", 14), width=15, command=self.show_progress, bg="#F5F5DC", fg="black", relief="raised")
+        back_button.pack(pady=10, anchor="center", side="bottom")
+
+    # Re-run the analysis each time the screen is shown - on a worker thread, the list fills in when it's done
+    # (old logs get rolled into a summary file as it goes, so it only ever reads the newest few hundred)
+    def refresh_hot_spots(self):
+        self.keylog.finish()  # make sure the last game is on disk
+        self.hot_spots_summary.config(text="Working out your tricky spots...")
+        self.run_in_background("hot-spots", self.analyze_hot_spots, self.show_hot_spot_stats)
+
+    # Runs on the worker thread - False if numpy isn't installed
+    def analyze_hot_spots(self):
+        import keylog
+
+        try:
+            return keylog.analyze_dir(self.keylog.directory)
+        except ImportError:
+            return False
+
+    def show_hot_spot_stats(self, stats):
+        if stats is False:
+            self.hot_spot_rows = []
+            self.hot_spots_summary.config(text="Tricky spots need numpy - pip install numpy")
+            self.hot_spots_list.set_count(0)
+            return
+        self.hot_spot_rows = stats["chunks"] if stats else []
+        self.engine.hot_spots = {start: rate for start, rate, _, _ in self.hot_spot_rows}
+        if not self.hot_spot_rows:
+            self.hot_spots_summary.config(text="No tricky spots yet! Play some more games to find them.")
+        else:
+            self.hot_spots_summary.config(text=f"From {stats['sessions']:,} game(s) and {stats['keystrokes']:,} keystrokes - "
+                                               f"click a spot to practice it")
+        self.hot_spots_list.set_count(len(self.hot_spot_rows))
+
+    def hot_spot_text(self, index):
+        start, rate, ms, _ = self.hot_spot_rows[index]
+        return f"Digits {start + 1}-{start + 10}: {rate:.0%} missed, {ms / 1000:.1f}s per key"
+
+    def practice_hot_spot(self, index):
+        self.practice_offset = self.hot_spot_rows[index][0]
+        self.start_practice()
+
+    # Work out the tricky spots in the background the first time Practice Mode opens - hints pick them up when ready
+    def load_hot_spots(self):
+        import keylog
+
+        self.run_in_background("hot-spots", lambda: keylog.hot_spots(self.keylog.directory),
+                               lambda spots: setattr(self.engine, "hot_spots", spots))
+
+    # Build the digit display, feedback label and keypad shared by both game screens
+    # Returns the display and feedback labels so each screen keeps its own pair
+    def build_game_widgets(self, frame):
         # Display the current digits (starts with "3.")
-        self.pi_display = tk.Label(self.root, text="3.", font=("Arial", 24, "bold"), bg="#E6F0FA")
-        self.pi_display.pack(pady=20, anchor="center")
-        self.practice_mode_widgets.append(self.pi_display)
+        pi_display = tk.Label(frame, text="3.", font=("Arial", 24, "bold"), bg="#E6F0FA")
+        pi_display.pack(pady=20, anchor="center")
 
-        # Initial instruction to get the player started
-        self.feedback = tk.Label(self.root, text="Start with 1", font=("Arial", 12), bg="#E6F0FA")
-        self.feedback.pack(pady=5)
-        self.practice_mode_widgets.append(self.feedback)
+        # Feedback label - the text gets set every time the screen is shown
+        feedback = tk.Label(frame, text="", font=("Arial", 12), bg="#E6F0FA")
+        feedback.pack(pady=5)
 
         # Create a keypad for clicking digits
-        self.keypad_frame = tk.Frame(self.root, bg="#E6F0FA")
-        self.keypad_frame.pack(pady=10)
-        self.practice_mode_widgets.append(self.keypad_frame)
+        keypad_frame = tk.Frame(frame, bg="#E6F0FA")
+        keypad_frame.pack(pady=10)
 
         buttons = [
             ("1", 0, 0), ("2", 0, 1), ("3", 0, 2),
@@ -287,166 +579,133 @@ class PiGame:
             ("0", 3, 1)
         ]
         for (num, row, col) in buttons:
-            btn = tk.Button(self.keypad_frame, text=num, font=("Arial", 18), width=5, height=2, command=lambda n=num: self.enter_digit(n, practice=True), bg="#F5F5DC", fg="black", relief="raised")
+            btn = tk.Button(keypad_frame, text=num, font=("Arial", 18), width=5, height=2, command=lambda n=num: self.enter_digit(n), bg="#F5F5DC", fg="black", relief="raised")
             btn.grid(row=row, column=col, padx=5, pady=5)
+        return pi_display, feedback
+
+    # Start practice mode where players can learn Pi digits with hints
+    def start_practice(self):
+        self.show_screen("practice")
+
+    # Build the practice screen once
+    def build_practice(self, frame):
+        self.practice_display, self.practice_feedback = self.build_game_widgets(frame)
 
         # Restart button to reset the game
-        self.restart_button = tk.Button(self.root, text="Restart", font=("Arial", 14), width=15, command=self.restart_practice, bg="#F5F5DC", fg="black", relief="raised")
+        self.restart_button = tk.Button(frame, text="Restart", font=("Arial", 14), width=15, command=self.restart_practice, bg="#F5F5DC", fg="black", relief="raised")
         self.restart_button.pack(pady=10)
-        self.practice_mode_widgets.append(self.restart_button)
 
         # Back button to return to the main menu
-        self.back_button = tk.Button(self.root, text="Back to Menu", font=("Arial", 14), width=15, command=self.create_main_menu, bg="#F5F5DC", fg="black", relief="raised")
-        self.back_button.pack(pady=10, anchor="center")
-        self.practice_mode_widgets.append(self.back_button)
+        back_button = tk.Button(frame, text="Back to Menu", font=("Arial", 14), width=15, command=self.create_main_menu, bg="#F5F5DC", fg="black", relief="raised")
+        back_button.pack(pady=10, anchor="center")
 
-        self.bind_keys()
+    # Reset the practice screen each time it's shown - starting wherever the search screen pointed us
+    def refresh_practice(self):
+        self.pi_display = self.practice_display
+        self.feedback = self.practice_feedback
+        self.start_mode("practice", self.practice_offset)
+        self.practice_offset = 0
+        if not self.hot_spots_loaded:
+            self.hot_spots_loaded = True
+            self.load_hot_spots()
 
     # Start the real game mode where players get 3 incorrect guesses before the game is over
     def start_real_game(self):
-        self.clear_screen()
-        self.user_input = ""
-        self.game_active = True
-        self.wrong_guesses = 0
-        self.current_mode = "real"
-
-        # Display the current digits (starts with "3.")
-        self.pi_display = tk.Label(self.root, text="3.", font=("Arial", 24, "bold"), bg="#E6F0FA")
-        self.pi_display.pack(pady=20, anchor="center")
-        self.real_game_widgets.append(self.pi_display)
-
-        # Initial instruction to get the player started
-        self.feedback = tk.Label(self.root, text="Start with 1 - 3 guesses left", font=("Arial", 12), bg="#E6F0FA")
-        self.feedback.pack(pady=5)
-        self.real_game_widgets.append(self.feedback)
+        self.show_screen("real")
 
-        # Create a keypad for clicking digits
-        self.keypad_frame = tk.Frame(self.root, bg="#E6F0FA")
-        self.keypad_frame.pack(pady=10)
-        self.real_game_widgets.append(self.keypad_frame)
-
-        buttons = [
-            ("1", 0, 0), ("2", 0, 1), ("3", 0, 2),
-            ("4", 1, 0), ("5", 1, 1), ("6", 1, 2),
-            ("7", 2, 0), ("8", 2, 1), ("9", 2, 2),
-            ("0", 3, 1)
-        ]
-        for (num, row, col) in buttons:
-            btn = tk.Button(self.keypad_frame, text=num, font=("Arial", 18), width=5, height=2, command=lambda n=num: self.enter_digit(n, practice=False), bg="#F5F5DC", fg="black", relief="raised")
-            btn.grid(row=row, column=col, padx=5, pady=5)
+    # Build the real game screen once
+    def build_real_game(self, frame):
+        self.real_display, self.real_feedback = self.build_game_widgets(frame)
 
         # Back button to return to the main menu
-        self.back_button = tk.Button(self.root, text="Back to Menu", font=("Arial", 14), width=15, command=self.create_main_menu, bg="#F5F5DC", fg="black", relief="raised")
-        self.back_button.pack(pady=10, anchor="center")
-        self.real_game_widgets.append(self.back_button)
+        back_button = tk.Button(frame, text="Back to Menu", font=("Arial", 14), width=15, command=self.create_main_menu, bg="#F5F5DC", fg="black", relief="raised")
+        back_button.pack(pady=10, anchor="center")
 
+    # Reset the real game screen each time it's shown
+    def refresh_real_game(self):
+        self.pi_display = self.real_display
+        self.feedback = self.real_feedback
+        self.start_mode("real")
+
+    # Start a fresh game in the engine and reset the display
+    def start_mode(self, mode, offset=0):
+        self.engine.start(mode, offset)
+        self.current_mode = mode
+        self.pi_display.config(text="".join(self.engine.display_window), fg="black")
+        self.feedback.config(text=self.engine.start_message())
         self.bind_keys()
 
-    # Handle digit entry check if correct and update scores in real game mode
-    def enter_digit(self, digit, practice=True):
-        if not self.game_active and not practice:
-            return  # Don't allow input if the game is over
-
-        # Calculate the index of the next digit to check
-        next_index = len(self.user_input) + 2
-
-        # Check if the player has reached the end of the Pi digits
-        # Prevent crash by returning cleanly
-        if next_index >= len(self.pi_digits):
-            self.pi_display.config(text="You reached the end!", fg="green")
-            self.play_buzzer()
-            self.game_active = False
-            self.feedback.config(text="You got all 500 digits!")
-            return
-
-        # Update the display to show the last 6 digits for readability
-        full_display = "3." + self.user_input
-        if len(full_display) <= 6:
-            display_text = full_display
-        else:
-            display_text = full_display[-6:]
-
-        # Check if the entered digit is correct
-        if digit == self.pi_digits[next_index]:
-            self.user_input += digit
-            if len(full_display) <= 5:
-                display_text = "3." + self.user_input
-            else:
-                display_text = ("3." + self.user_input)[-6:]
-            self.pi_display.config(text=display_text, fg="green")
-            if practice:
-                if self.show_hint:
-                    self.feedback.config(text="Back to normal - keep going")
-                    self.show_hint = False
-                else:
-                    self.feedback.config(text="Nice one! Keep going")
-            else:
-                self.feedback.config(text=f"Correct - {3 - self.wrong_guesses} guesses left")
-        else:
-            # In Practice Mode show the correct digit and the next 5 to help the player learn
-            if practice:
-                self.pi_display.config(text=display_text, fg="green")
-                next_five = self.pi_digits[next_index:next_index + 5]
-                self.feedback.config(text=f"Incorrect, the next number was {self.pi_digits[next_index]} - Next 5: {next_five}")
-                self.show_hint = True
-            # In Real Game mode count wrong guesses and end after 3
-            else:
-                self.play_buzzer() # sound effect
-                self.wrong_guesses += 1
-                if self.wrong_guesses < 3:
-                    self.feedback.config(text=f"Wrong! {3 - self.wrong_guesses} guesses left - try again")
-                    self.pi_display.config(text=display_text, fg="green")
-                else:
-                    self.play_buzzer() # sound effect
-                    self.game_active = False
-                    score = len(self.user_input)
-                    today = datetime.now().strftime("%Y-%m-%d")
-                    # Update daily scores if this is a new high for the day
-                    if today not in self.daily_scores or score > self.daily_scores[today]:
-                        self.daily_scores[today] = score
-                        self.save_daily_scores()
-                    # Update all-time high score if applicable
-                    if score > self.high_score:
-                        self.high_score = score
-                        self.feedback.config(text=f"Game Over! New high score: {score}")
-                        self.save_high_score()
-                    else:
-                        self.feedback.config(text=f"Game Over! Score: {score}")
-                    # Show the next 10 digits for reference
-                    next_ten = self.pi_digits[next_index:next_index + 10]
-                    if self.root.winfo_exists():
-                        messagebox.showinfo("Game Over", f"Next 10 digits: {next_ten}")
+    # Pass a digit to the engine and draw whatever it decided - each step is timed for the latency histograms
+    def enter_digit(self, digit):
+        with self.latency.phase("key"):
+            with self.latency.phase("engine"):
+                result = self.engine.enter_digit(digit)
+            if result is None:
+                return  # Don't allow input if the game is over
+
+            with self.latency.phase("widgets"):
+                if result.display is not None:
+                    self.pi_display.config(text=result.display, fg=result.color)
+                self.feedback.config(text=result.feedback)
+            if result.buzzes:
+                self.play_buzzer(result.buzzes) # sound effect
+
+            if result.game_over:
+                # Save the game - the database keeps the daily best and the high score up to date
+                with self.latency.phase("save"):
+                    self.scores.record("real", result.score, self.engine.wrong_positions, self.engine.duration())
+        # Show the next 10 digits for reference (outside the timer - the popup waits for the player)
+        if result.game_over and self.root.winfo_exists():
+            messagebox.showinfo("Game Over", f"Next 10 digits: {result.reveal}")
 
     # Handle keyboard input by routing to the correct mode
+    # Shift, Ctrl, the arrows and F12 (the debug overlay) come through with an empty char - "" is "in" any string,
+    # so check it's exactly one digit or they'd count as wrong guesses
     def key_press(self, event):
-        if event.char in "0123456789":
-            if self.current_mode == "practice":
-                self.enter_digit(event.char, practice=True)
-            elif self.current_mode == "real":
-                self.enter_digit(event.char, practice=False)
+        if len(event.char) == 1 and event.char in "0123456789" and self.current_mode in ("practice", "real"):
+            self.enter_digit(event.char)
 
-    # Reset Practice Mode to start over
+    # Reset Practice Mode to start over (from the same digit it started at)
     def restart_practice(self):
-        self.user_input = ""
-        self.game_active = True
-        self.show_hint = False
-        self.current_mode = "practice"
-        self.pi_display.config(text="3.", fg="black")
-        self.feedback.config(text="Start with 1")
-        self.bind_keys()
+        offset = self.engine.start_offset
+        self.save_practice()
+        self.start_mode("practice", offset)
 
-    # Clear widgets from the screen to switch modes
-    def clear_screen(self):
-        self.unbind_keys()
-        for widget in self.root.winfo_children():
-            widget.pack_forget()
-        self.pi_display = None
+    # Practice runs count as a game too - save one when the player restarts or leaves (if they typed anything)
+    def save_practice(self):
+        if self.engine.mode == "practice" and (self.engine.entered() or self.engine.wrong_positions):
+            self.scores.record("practice", self.engine.entered(), self.engine.wrong_positions, self.engine.duration())
+            self.engine.start("practice")
 
 # Create a new Tkinter window and start the game
-def run_game():
+# --latency-log saves the per-phase latency percentiles when the window closes
+# --profile records a cProfile of the whole session (open it with snakeviz or pstats)
+def run_game(latency_log=None, profile=None, audio_backend="auto"):
     root = tk.Tk()
-    game = PiGame(root)
+    game = PiGame(root, audio_backend=audio_backend)
+    profiler = None
+    if profile:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
     root.mainloop()
+    if profiler:
+        profiler.disable()
+        profiler.dump_stats(profile)
+        print(f"Saved profile to {profile}")
+    game.save_practice()
+    game.scores.close()  # flush any scores still waiting to be written
+    game.audio.close()
+    game.keylog.finish()
+    if latency_log:
+        game.latency.dump(latency_log)
 
 if __name__ == "__main__":
-    run_game()
\ No newline at end of file
+    import argparse
+    parser = argparse.ArgumentParser(description="Pi Memory Game")
+    parser.add_argument("--latency-log", help="file to save per-keystroke latency percentiles to on exit")
+    parser.add_argument("--profile", help="file to save a cProfile of this session to")
+    parser.add_argument("--audio", default="auto", choices=["auto", *audio.BACKENDS],
+                        help="where sounds play (default: the first backend that works here)")
+    args = parser.parse_args()
+    run_game(args.latency_log, args.profile, args.audio)
@@ -0,0 +1,250 @@
+# Pi digit generator for the Pi Memory Game
+# Builds (or extends) the pi_digits.bin file the game reads, using the Chudnovsky formula with binary splitting.
+# The series is cut into chunks that run on a ProcessPoolExecutor, then the partial results are merged pairwise.
+# gmpy2 makes the big-number math a lot faster if it's installed, otherwise plain Python ints are used.
+#
+# Usage:
+#   python pi_generator.py 1000000                 # write 1M digits to pi_digits.bin
+#   python pi_generator.py 2000000 --workers 8     # extend the same file to 2M digits
+#
+# After a run the series state is saved next to the digit file (pi_digits.bin.bs), so extending the file later
+# only has to compute the new terms instead of starting from scratch.
+# The integrity manifest (pi_digits.bin.manifest, see digit_manifest.py) and the search index (pi_digits.bin.idx,
+# see digit_index.py) are rewritten after every run too.
+
+import argparse
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from digit_index import DigitIndex, index_path
+from digit_manifest import manifest_path, write_manifest
+from digit_source import DIGITS_FILE, DigitSource
+
+try:
+    import gmpy2
+    mpz = gmpy2.mpz
+    isqrt = gmpy2.isqrt
+except ImportError:
+    gmpy2 = None
+    mpz = int
+    isqrt = math.isqrt
+
+# Python 3.11+ refuses to turn huge ints into strings unless we lift the limit
+if hasattr(sys, "set_int_max_str_digits"):
+    sys.set_int_max_str_digits(0)
+
+# Chudnovsky constants
+C = 640320
+C3_OVER_24 = C ** 3 // 24
+DIGITS_PER_TERM = math.log10(C3_OVER_24 / 72)  # each term adds about 14.18 digits
+GUARD_DIGITS = 20  # extra digits computed and thrown away so the last digits we keep are exact
+CHECKPOINT_MAGIC = b"PIBS1\n"
+
+
+# Binary splitting over the terms [a, b) - returns (P, Q, T)
+def bs(a, b):
+    if b - a == 1:
+        if a == 0:
+            p = q = mpz(1)
+        else:
+            p = mpz((6 * a - 5) * (2 * a - 1) * (6 * a - 1))
+            q = mpz(a) * a * a * C3_OVER_24
+        t = p * (13591409 + 545140134 * a)
+        if a & 1:
+            t = -t
+        return p, q, t
+    m = (a + b) // 2
+    return merge(bs(a, m), bs(m, b))
+
+
+# Combine the results of two neighbouring ranges [a, m) and [m, b) into [a, b)
+def merge(left, right):
+    p1, q1, t1 = left
+    p2, q2, t2 = right
+    return p1 * p2, q1 * q2, q2 * t1 + p1 * t2
+
+
+# Worker entry points - these run in the process pool so they need to be top level functions
+def _bs_range(bounds):
+    return bs(*bounds)
+
+
+def _merge_pair(pair):
+    return merge(*pair)
+
+
+# Run the series over [start, end) across the pool and reduce the chunks pairwise
+def parallel_bs(start, end, pool, workers):
+    chunk_count = max(1, min(end - start, workers * 4))
+    step = (end - start) / chunk_count
+    bounds = []
+    for i in range(chunk_count):
+        a = start + int(i * step)
+        b = start + int((i + 1) * step) if i < chunk_count - 1 else end
+        if b > a:
+            bounds.append((a, b))
+
+    parts = list(pool.map(_bs_range, bounds))
+    # Merge neighbours level by level so every level runs in parallel too
+    while len(parts) > 1:
+        pairs = [(parts[i], parts[i + 1]) for i in range(0, len(parts) - 1, 2)]
+        merged = list(pool.map(_merge_pair, pairs))
+        if len(parts) % 2:
+            merged.append(parts[-1])
+        parts = merged
+    return parts[0]
+
+
+# Number of series terms needed for the given number of digits
+def terms_for(digits):
+    return int((digits + GUARD_DIGITS) / DIGITS_PER_TERM) + 2
+
+
+# Turn the series result into a string of digits after the "3."
+def digits_from_series(p, q, t, digits):
+    precision = digits + GUARD_DIGITS
+    one = mpz(10) ** precision
+    sqrt_10005 = isqrt(mpz(10005) * one * one)
+    pi = (q * 426880 * sqrt_10005) // t
+    text = str(pi)
+    return text[1:digits + 1]
+
+
+# Checkpoint file helpers - stores the term count plus P, Q and T of the series computed so far
+def checkpoint_path(out_path):
+    return out_path + ".bs"
+
+
+def _write_int(f, value):
+    value = int(value)
+    data = value.to_bytes((value.bit_length() + 8) // 8, "little", signed=True)
+    f.write(len(data).to_bytes(8, "little"))
+    f.write(data)
+
+
+def _read_int(f):
+    size = int.from_bytes(f.read(8), "little")
+    data = f.read(size)
+    if len(data) != size:
+        raise ValueError("truncated checkpoint")
+    return int.from_bytes(data, "little", signed=True)
+
+
+def save_checkpoint(path, terms, series):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(CHECKPOINT_MAGIC)
+        _write_int(f, terms)
+        for value in series:
+            _write_int(f, value)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def load_checkpoint(path):
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "rb") as f:
+            if f.read(len(CHECKPOINT_MAGIC)) != CHECKPOINT_MAGIC:
+                return None
+            terms = _read_int(f)
+            series = tuple(mpz(_read_int(f)) for _ in range(3))
+        return terms, series
+    except (OSError, ValueError):
+        return None  # A broken checkpoint just means we start the series over
+
+
+# Length of the digit file that's already there (0 if it doesn't exist)
+def existing_length(path):
+    return os.path.getsize(path) if os.path.exists(path) else 0
+
+
+# Compute the digits and write them to out_path, reusing the checkpoint and existing file where possible
+def generate(digits, out_path=DIGITS_FILE, workers=None, fresh=False):
+    workers = workers or os.cpu_count() or 1
+    have = 0 if fresh else existing_length(out_path)
+    if have >= digits:
+        print(f"{out_path} already has {have} digits, nothing to do")
+        return 0
+
+    ckpt_path = checkpoint_path(out_path)
+    checkpoint = None if fresh else load_checkpoint(ckpt_path)
+    target_terms = terms_for(digits)
+    started = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        if checkpoint:
+            done_terms, series = checkpoint
+            print(f"Resuming from checkpoint with {done_terms} terms")
+            if done_terms < target_terms:
+                series = merge(series, parallel_bs(done_terms, target_terms, pool, workers))
+            else:
+                target_terms = done_terms  # extra terms only make the result more precise
+        else:
+            series = parallel_bs(0, target_terms, pool, workers)
+    series_time = time.perf_counter() - started
+
+    text = digits_from_series(*series, digits)
+    save_checkpoint(ckpt_path, target_terms, series)
+
+    # Keep what's already on disk and only append the new digits - but check the overlap first so a bad
+    # file never gets silently extended
+    if have:
+        overlap = min(have, 1024)
+        with open(out_path, "rb") as f:
+            f.seek(have - overlap)
+            tail = f.read(overlap).decode("ascii", errors="replace")
+        if tail != text[have - overlap:have]:
+            print(f"Existing digits in {out_path} don't match the computed ones, rewriting the whole file")
+            have = 0
+
+    if have:
+        with open(out_path, "ab") as f:
+            f.write(text[have:].encode("ascii"))
+            f.flush()
+            os.fsync(f.fileno())
+    else:
+        tmp_path = out_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(text.encode("ascii"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, out_path)
+
+    # Hash every 64 KiB chunk so the game can tell if the file ever gets damaged (see digit_manifest.py)
+    write_manifest(manifest_path(out_path), text.encode("ascii"))
+
+    # Build the search index now so the Find in Pi screen never has to
+    source = DigitSource.from_file(out_path)
+    try:
+        DigitIndex.build(source, index_path(source)).close()
+    finally:
+        source.close()
+
+    elapsed = time.perf_counter() - started
+    backend = "gmpy2" if gmpy2 else "python int"
+    print(f"Wrote {digits} digits to {out_path} ({digits - have} new) in {elapsed:.2f}s "
+          f"using {workers} worker(s) and {backend} - series {series_time:.2f}s, "
+          f"{digits / elapsed:,.0f} digits/second")
+    return digits - have
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate digits of pi for the Pi Memory Game")
+    parser.add_argument("digits", type=int, help="total number of digits after the decimal point")
+    parser.add_argument("--out", default=DIGITS_FILE, help="digit file to write (default: pi_digits.bin)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--fresh", action="store_true", help="ignore the existing file and checkpoint")
+    args = parser.parse_args(argv)
+    if args.digits <= 0:
+        parser.error("digits must be positive")
+    generate(args.digits, args.out, args.workers, args.fresh)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+# Multi-player server for the Pi Memory Game (pi day events, classrooms, kiosks)
+# One asyncio process hosts any number of practice/real games over plain TCP - each connection gets its own
+# PiEngine, all of them reading the same memory-mapped digit store. Finished games go to one shared ScoreDB,
+# whose single writer thread already puts every save through one connection in order.
+#
+# The protocol is one line per message. The client sends commands, the server answers each with one JSON line:
+#   START practice [offset] / START real   -> {"ok": true, "mode": ..., "display": ..., "feedback": ...}
+#   K <digit>                              -> the engine's KeyResult as JSON (or {"ignored": true}), an error for
+#                                             anything that isn't a single digit
+#   HIGH                                   -> {"high_score": ...}
+#   QUIT                                   -> {"bye": true} and the connection closes
+#
+# Usage:
+#   python pi_server.py                          # listen on 127.0.0.1:3141
+#   python pi_server.py --host 0.0.0.0 --port 3141
+#   python load_test.py                          # hammer a server with lots of sessions at once
+
+import argparse
+import asyncio
+import json
+
+from digit_manifest import CorruptDigitsError
+from digit_source import load_digit_source
+from engine import PiEngine
+from score_db import DB_FILE, ScoreDB
+
+DEFAULT_PORT = 3141
+MAX_LINE = 256  # longest command we'll read - anything longer means a broken client
+DIGITS = set("0123456789")
+
+
+class GameServer:
+    def __init__(self, digits, scores):
+        self.digits = digits  # shared read-only by every session
+        self.scores = scores
+        self.high_score = scores.high_score()
+        self.sessions = 0  # connected right now
+        self.games = 0  # finished games saved since the server started
+
+    # Save a finished game - record() only queues it for the database writer thread
+    def save(self, engine):
+        if engine.mode == "real":
+            self.scores.record("real", engine.position, engine.wrong_positions, engine.duration())
+            self.high_score = max(self.high_score, engine.position)
+        elif engine.entered() or engine.wrong_positions:
+            self.scores.record("practice", engine.entered(), engine.wrong_positions, engine.duration())
+        else:
+            return
+        self.games += 1
+
+    # One connected player - reads commands until QUIT or the connection drops
+    async def handle(self, reader, writer):
+        self.sessions += 1
+        engine = PiEngine(self.digits, high_score=self.high_score)
+        started = False
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+                    break
+                if not line:
+                    break
+                parts = line.decode("ascii", errors="replace").split()
+                if not parts:
+                    continue
+                command = parts[0].upper()
+
+                try:
+                    if command == "K" and started and (len(parts) != 2 or parts[1] not in DIGITS):
+                        reply = {"error": "K takes one digit, 0-9"}  # never reaches the engine, like key_press in the game
+                    elif command == "K" and started:
+                        result = engine.enter_digit(parts[1])
+                        reply = {"ignored": True} if result is None else result._asdict()
+                        if result is not None and result.game_over:
+                            self.save(engine)
+                            started = False
+                    elif command == "K" and not started:
+                        reply = {"error": "send START practice or START real first"}
+                    elif command == "START" and len(parts) >= 2 and parts[1] in ("practice", "real"):
+                        if started and engine.mode == "practice":
+                            self.save(engine)  # a practice run counts as a game when the player moves on
+                        engine.high_score = self.high_score
+                        engine.start(parts[1], int(parts[2]) if len(parts) > 2 and parts[2].isdigit() else 0)
+                        started = True
+                        reply = {"ok": True, "mode": engine.mode, "display": "".join(engine.display_window),
+                                 "feedback": engine.start_message()}
+                    elif command == "HIGH":
+                        reply = {"high_score": self.high_score}
+                    elif command == "QUIT":
+                        writer.write(b'{"bye": true}\n')
+                        break
+                    else:
+                        reply = {"error": f"unknown command: {line.decode('ascii', errors='replace').strip()[:40]}"}
+                except CorruptDigitsError as error:
+                    # Don't mark the player wrong because of a damaged digit file
+                    reply = {"error": str(error)}
+                    started = False
+
+                writer.write(json.dumps(reply).encode("ascii") + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            if started and engine.mode == "practice":
+                self.save(engine)
+            self.sessions -= 1
+            try:
+                writer.close()
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def serve(self, host="127.0.0.1", port=DEFAULT_PORT):
+        server = await asyncio.start_server(self.handle, host, port, limit=MAX_LINE, backlog=4096)
+        address = server.sockets[0].getsockname()
+        # load_test.py reads this line to find out which port we got when started with --port 0
+        print(f"Listening on {address[0]}:{address[1]}", flush=True)
+        async with server:
+            await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pi Memory Game multi-player server")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="port to listen on (0 picks a free one)")
+    parser.add_argument("--db", default=DB_FILE, help="score database shared by every session (default: scores.db)")
+    args = parser.parse_args(argv)
+
+    digits = load_digit_source()
+    scores = ScoreDB(args.db)
+    server = GameServer(digits, scores)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        scores.close()  # flush any games still waiting to be written
+        print(f"Saved {server.games} game(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+# Keystroke replay harness for the Pi Memory Game
+# Feeds recorded or synthetic keystroke streams straight into PiEngine - no window needed - so we can
+# regression-test the rules and see how fast the engine handles long recitations.
+#
+# Usage:
+#   python replay.py --bench                        # keystrokes/second and memory per keystroke, 1k to 1M digits deep
+#   python replay.py --mode real recording.txt      # replay a recorded stream (any non-digit chars are ignored)
+
+import argparse
+import random
+import string
+import sys
+import time
+import tracemalloc
+
+from digit_source import DigitSource, load_digit_source
+from engine import PiEngine
+
+BENCH_DEPTHS = (1_000, 10_000, 90_000, 1_000_000)
+
+
+# Read a recorded keystroke stream from a file - only digit characters count as keystrokes
+def load_stream(path):
+    with open(path, "r") as f:
+        return "".join(ch for ch in f.read() if ch in "0123456789")
+
+
+# Make a keystroke stream that recites `depth` correct digits with some wrong guesses mixed in
+# In real mode at most max_wrong mistakes are made so the game doesn't end before the depth is reached
+def synthetic_stream(digits, depth, error_rate=0.01, max_wrong=None, seed=314):
+    rng = random.Random(seed)
+    correct = digits.digits(0, depth)
+    keys = []
+    wrong = 0
+    for digit in correct:
+        if rng.random() < error_rate and (max_wrong is None or wrong < max_wrong):
+            keys.append(str((int(digit) + rng.randint(1, 9)) % 10))
+            wrong += 1
+        keys.append(digit)
+    return "".join(keys)
+
+
+# Feed every keystroke into the engine - returns a summary of what happened
+def replay(engine, keys, mode="practice"):
+    engine.start(mode)
+    stats = {"keystrokes": 0, "wrong": 0, "ignored": 0, "game_over": False, "score": 0}
+    for key in keys:
+        stats["keystrokes"] += 1
+        position = engine.position
+        result = engine.enter_digit(key)
+        if result is None:
+            stats["ignored"] += 1
+        elif engine.position == position:
+            stats["wrong"] += 1  # the cursor only stays put on a wrong digit (or at the end of the digits)
+        if result is not None and result.game_over:
+            stats["game_over"] = True
+    stats["score"] = engine.position
+    return stats
+
+
+# Time one replay, then count the memory blocks each keystroke leaves behind and the peak traced memory
+def bench_one(engine, keys, mode):
+    # Warm-up pass so one-off allocations (caches, interned strings) don't count
+    replay(engine, keys[:1000], mode)
+
+    started = time.perf_counter()
+    replay(engine, keys, mode)
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    replay(engine, keys, mode)
+    peak = tracemalloc.get_traced_memory()[1]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    retained_blocks = sum(stat.count_diff for stat in after.compare_to(before, "filename"))
+    return len(keys) / elapsed, retained_blocks / len(keys), peak
+
+
+# Run the benchmark for both modes at several recitation depths
+# The shipped digit store is shorter than the deepest run, so that falls back to a random store of the
+# same size (like verify.bench) - the engine only compares digits, it doesn't care whether they're pi
+def run_bench(depths=BENCH_DEPTHS, seed=314):
+    digits = load_digit_source()
+    if len(digits) < max(depths):
+        print(f"digit store has {len(digits):,} digits - using a random {max(depths):,} digit store")
+        digits = DigitSource.from_string("".join(random.Random(seed).choices(string.digits, k=max(depths))))
+    engine = PiEngine(digits)
+    print(f"{'mode':<10}{'depth':>10}{'keys/s':>14}{'us/key':>9}{'retained/key':>14}{'peak KiB':>10}")
+    for mode in ("practice", "real"):
+        for depth in depths:
+            max_wrong = 2 if mode == "real" else None
+            keys = synthetic_stream(digits, depth, max_wrong=max_wrong)
+            rate, blocks, peak = bench_one(engine, keys, mode)
+            print(f"{mode:<10}{depth:>10,}{rate:>14,.0f}{1e6 / rate:>9.2f}{blocks:>14.4f}{peak / 1024:>10.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay keystroke streams through the Pi Memory Game engine")
+    parser.add_argument("stream", nargs="?", help="file with a recorded keystroke stream")
+    parser.add_argument("--mode", choices=("practice", "real"), default="practice")
+    parser.add_argument("--bench", action="store_true", help="run the keystroke benchmark")
+    args = parser.parse_args(argv)
+
+    if args.bench:
+        run_bench()
+        return 0
+    if not args.stream:
+        parser.error("give a stream file or --bench")
+
+    stats = replay(PiEngine(load_digit_source()), load_stream(args.stream), args.mode)
+    print(", ".join(f"{key}: {value}" for key, value in stats.items()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
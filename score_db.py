@@ -0,0 +1,296 @@
+# SQLite score history for the Pi Memory Game
+# Every finished game goes into scores.db with its time, mode, score, where the wrong guesses were and how long
+# it took. Triggers keep a per-day summary table (daily best, game count, streak) and a one-row totals table up to
+# date, so the progress screen and graph only ever query the slice they show - nothing gets loaded up front.
+#
+# Writes happen on a background thread (one transaction per batch) so saving never blocks the window, and the
+# database runs in WAL mode with synchronous=FULL so a crash can't leave it half written.
+# The first time the database is opened the old daily_scores.txt / high_score.txt / scores_journal.txt files are
+# imported once.
+
+import os
+import queue
+import sqlite3
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+DB_FILE = "scores.db"
+BATCH_SIZE = 64  # most games the writer pulls off the queue per transaction
+
+_STOP = object()  # queue marker for the writer thread
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    played_at TEXT NOT NULL,
+    day TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    wrong_positions TEXT NOT NULL DEFAULT '',
+    duration REAL
+);
+CREATE INDEX IF NOT EXISTS games_by_day ON games(day);
+CREATE INDEX IF NOT EXISTS games_by_score ON games(mode, score);
+
+CREATE TABLE IF NOT EXISTS daily_summary (
+    day TEXT PRIMARY KEY,
+    best INTEGER NOT NULL,
+    games INTEGER NOT NULL,
+    total INTEGER NOT NULL,
+    streak INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS daily_by_best ON daily_summary(best DESC, day);
+
+CREATE TABLE IF NOT EXISTS totals (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    days INTEGER NOT NULL,
+    best_sum INTEGER NOT NULL,
+    longest_streak INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO totals VALUES (1, 0, 0, 0);
+
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+
+-- Real games feed the daily summary - the streak is the run of days played in a row ending on that day
+CREATE TRIGGER IF NOT EXISTS games_to_daily AFTER INSERT ON games WHEN NEW.mode = 'real' BEGIN
+    INSERT INTO daily_summary (day, best, games, total, streak)
+    VALUES (NEW.day, NEW.score, 1, NEW.score,
+            COALESCE((SELECT streak FROM daily_summary WHERE day = date(NEW.day, '-1 day')), 0) + 1)
+    ON CONFLICT (day) DO UPDATE SET best = MAX(best, excluded.best), games = games + 1, total = total + excluded.total;
+END;
+
+CREATE TRIGGER IF NOT EXISTS daily_insert_totals AFTER INSERT ON daily_summary BEGIN
+    UPDATE totals SET days = days + 1, best_sum = best_sum + NEW.best,
+                      longest_streak = MAX(longest_streak, NEW.streak) WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS daily_update_totals AFTER UPDATE OF best ON daily_summary BEGIN
+    UPDATE totals SET best_sum = best_sum + NEW.best - OLD.best WHERE id = 1;
+END;
+"""
+
+INSERT_GAME = "INSERT INTO games (played_at, day, mode, score, wrong_positions, duration) VALUES (?, ?, ?, ?, ?, ?)"
+
+
+# Bounds for every day that starts with the given prefix ("2025", "2025-04", or "" for all of them)
+def _prefix_bounds(prefix):
+    return prefix, prefix + "\uffff"
+
+
+# Parse an old "date:score" line, returns None if it's malformed
+def _parse_legacy(line):
+    try:
+        day, score = line.strip().split(":")
+        return day, int(score)
+    except ValueError:
+        return None
+
+
+class ScoreDB:
+    def __init__(self, path=DB_FILE, legacy_daily_file="daily_scores.txt", legacy_high_file="high_score.txt",
+                 legacy_journal_file="scores_journal.txt", recorder=None):
+        self.path = path
+        self.legacy_daily_file = legacy_daily_file
+        self.legacy_high_file = legacy_high_file
+        self.legacy_journal_file = legacy_journal_file
+        self.recorder = recorder  # optional LatencyRecorder - times each write transaction
+
+        self._local = threading.local()  # one connection per thread, opened the first time it's needed
+        self._connections = []
+        self._init_lock = threading.Lock()
+        self._ready = False
+        self._queue = queue.Queue()
+        self._writer = None
+
+    # Connection for the calling thread - the first one also creates the schema and runs the migration
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=FULL")
+            with self._init_lock:
+                if not self._ready:
+                    conn.executescript(SCHEMA)
+                    self._migrate(conn)
+                    self._ready = True
+                self._connections.append(conn)
+            self._local.conn = conn
+        return conn
+
+    # One-time import of the old text files
+    def _migrate(self, conn):
+        if conn.execute("SELECT 1 FROM meta WHERE key = 'migrated'").fetchone():
+            return
+        records = []
+        for path in (self.legacy_daily_file, self.legacy_journal_file):
+            if os.path.exists(path):
+                with open(path, "r") as f:
+                    records.extend(record for record in map(_parse_legacy, f) if record)
+        legacy_high = 0
+        if os.path.exists(self.legacy_high_file):
+            with open(self.legacy_high_file, "r") as f:
+                try:
+                    legacy_high = int(f.read().strip())
+                except ValueError:
+                    legacy_high = 0
+
+        # Oldest first so the streaks come out right
+        records.sort()
+        with conn:
+            conn.executemany(INSERT_GAME, [(f"{day}T00:00:00", day, "real", score, "", None) for day, score in records])
+            conn.execute("INSERT OR REPLACE INTO meta VALUES ('legacy_high_score', ?)", (str(legacy_high),))
+            conn.execute("INSERT OR REPLACE INTO meta VALUES ('migrated', ?)", (datetime.now().isoformat(),))
+        if records:
+            print(f"Imported {len(records)} old score(s) into {self.path}")
+
+    # Queue a finished game for the writer thread - returns right away
+    def record(self, mode, score, wrong_positions=(), duration=None, played_at=None):
+        played_at = played_at or datetime.now()
+        row = (played_at.isoformat(timespec="seconds"), played_at.strftime("%Y-%m-%d"), mode, score,
+               ",".join(str(position) for position in wrong_positions), duration)
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._write_loop, name="score-db", daemon=True)
+            self._writer.start()
+        self._queue.put(row)
+
+    # Background writer - pulls games in batches and commits each batch in one transaction
+    def _write_loop(self):
+        conn = self._conn()
+        while True:
+            item = self._queue.get()
+            batch = []
+            stop = False
+            while True:
+                if item is _STOP:
+                    stop = True
+                else:
+                    batch.append(item)
+                if stop or len(batch) >= BATCH_SIZE:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                started = time.perf_counter_ns()
+                with conn:
+                    conn.executemany(INSERT_GAME, batch)
+                if self.recorder is not None:
+                    # The whole batch transaction - the commit's sync to disk included
+                    self.recorder.record("db_write", time.perf_counter_ns() - started)
+            if stop:
+                return
+
+    # Close the calling thread's connection - short-lived worker threads (like an export) call this when they're
+    # done so their connection and its file handles don't hang around until close()
+    def release(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            return
+        self._local.conn = None
+        with self._init_lock:
+            if conn in self._connections:
+                self._connections.remove(conn)
+        conn.close()
+
+    # Flush everything still queued, stop the writer and close the connections
+    def close(self):
+        if self._writer is not None and self._writer.is_alive():
+            self._queue.put(_STOP)
+            self._writer.join()
+        with self._init_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections = []
+        self._local = threading.local()
+
+    # All-time best Real Game score
+    def high_score(self):
+        conn = self._conn()
+        best = conn.execute("SELECT MAX(score) FROM games WHERE mode = 'real'").fetchone()[0] or 0
+        legacy = conn.execute("SELECT value FROM meta WHERE key = 'legacy_high_score'").fetchone()
+        return max(best, int(legacy[0]) if legacy else 0)
+
+    # Number of days with a score, optionally only those starting with a prefix
+    def day_count(self, prefix=""):
+        return self._conn().execute("SELECT COUNT(*) FROM daily_summary WHERE day >= ? AND day < ?",
+                                    _prefix_bounds(prefix)).fetchone()[0]
+
+    # Number of days with a score before the given day
+    def day_count_before(self, day):
+        return self._conn().execute("SELECT COUNT(*) FROM daily_summary WHERE day < ?", (day,)).fetchone()[0]
+
+    # One page of (day, best) rows for a date prefix, newest first
+    def days(self, prefix="", offset=0, limit=50):
+        return self._conn().execute(
+            "SELECT day, best FROM daily_summary WHERE day >= ? AND day < ? ORDER BY day DESC LIMIT ? OFFSET ?",
+            (*_prefix_bounds(prefix), limit, offset)).fetchall()
+
+    # (day, best) rows between two days (inclusive), oldest first
+    def days_between(self, first, last):
+        return self._conn().execute("SELECT day, best FROM daily_summary WHERE day >= ? AND day <= ? ORDER BY day",
+                                    (first, last)).fetchall()
+
+    # Weekly or monthly min/mean/max of the daily bests between two days
+    # Returns (mean julian day, min, mean, max) per bucket, oldest first
+    def rollups(self, first, last, bucket="week"):
+        key = "strftime('%Y-%W', day)" if bucket == "week" else "substr(day, 1, 7)"
+        return self._conn().execute(
+            f"SELECT AVG(julianday(day)), MIN(best), AVG(best), MAX(best) FROM daily_summary "
+            f"WHERE day >= ? AND day <= ? GROUP BY {key} ORDER BY 1", (first, last)).fetchall()
+
+    # First and last day with a score, and the lowest and highest daily best (all index lookups)
+    def bounds(self):
+        conn = self._conn()
+        first, last = conn.execute("SELECT MIN(day), MAX(day) FROM daily_summary").fetchone()
+        low, high = conn.execute("SELECT MIN(best), MAX(best) FROM daily_summary").fetchone()
+        return first, last, low, high
+
+    # Average daily best, best day, current and longest streak - read from the materialized tables
+    def stats(self):
+        conn = self._conn()
+        days, best_sum, longest = conn.execute("SELECT days, best_sum, longest_streak FROM totals WHERE id = 1").fetchone()
+        best_day = conn.execute("SELECT day, best FROM daily_summary ORDER BY best DESC, day LIMIT 1").fetchone()
+        last = conn.execute("SELECT day, streak FROM daily_summary ORDER BY day DESC LIMIT 1").fetchone()
+        current = 0
+        if last and last[0] >= (date.today() - timedelta(days=1)).isoformat():
+            current = last[1]
+        return {
+            "average": best_sum / days if days else 0,
+            "best_day": best_day or ("N/A", 0),
+            "current_streak": current,
+            "longest_streak": longest,
+        }
+
+    # Daily best at the given percentile (0-100) - walks the best score index
+    def percentile(self, pct):
+        days = self.day_count()
+        if not days:
+            return 0
+        offset = min(days - 1, int(days * pct / 100))
+        return self._conn().execute("SELECT best FROM daily_summary ORDER BY best LIMIT 1 OFFSET ?",
+                                    (offset,)).fetchone()[0]
+
+    # Years that have at least one score, newest first - one index lookup per year
+    def years(self):
+        conn = self._conn()
+        years = []
+        upper = "\uffff"
+        while True:
+            day = conn.execute("SELECT MAX(day) FROM daily_summary WHERE day < ?", (upper,)).fetchone()[0]
+            if day is None:
+                return years
+            years.append(day[:4])
+            upper = day[:4]
+
+    # Stream (day, best) rows oldest first in chunks, starting at `since` (inclusive)
+    def iter_days(self, since="", chunk_size=1000):
+        conn = self._conn()
+        rows = conn.execute("SELECT day, best FROM daily_summary WHERE day >= ? ORDER BY day LIMIT ?",
+                            (since, chunk_size)).fetchall()
+        while rows:
+            yield rows
+            rows = conn.execute("SELECT day, best FROM daily_summary WHERE day > ? ORDER BY day LIMIT ?",
+                                (rows[-1][0], chunk_size)).fetchall()
@@ -0,0 +1,184 @@
+# Score export for the Pi Memory Game
+# Streams the daily scores out of the score database in fixed-size chunks on a worker thread, so the window keeps
+# responding and memory stays the same however long the history is. CSV exports are incremental - only the days
+# added since the last export get appended (the last exported day is rewritten in case its best went up since).
+# Parquet output needs pyarrow and is always a full export, written one row group per chunk.
+#
+# Usage from the command line:
+#   python score_export.py                              # incremental CSV export to scores_export.csv
+#   python score_export.py --full --parquet scores.parquet
+
+import argparse
+import csv
+import os
+import queue
+import threading
+
+CSV_FILE = "scores_export.csv"
+CSV_HEADER = ["Date", "Score"]
+CHUNK_SIZE = 1000  # rows pulled from the score database at a time
+
+
+# Find where the last row of an existing export starts and which date it holds
+# Only reads the tail of the file - returns (offset, date) or None if there's nothing usable to append to
+def _last_row(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as f:
+        size = f.seek(0, os.SEEK_END)
+        f.seek(max(0, size - 256))
+        tail = f.read()
+        f.seek(0)
+        header = f.readline().decode("utf-8", errors="replace").strip()
+    if header != ",".join(CSV_HEADER) or not tail.endswith(b"\n"):
+        return None
+    lines = tail[:-1].split(b"\n")
+    if len(lines) < 2 and size > len(tail):
+        return None  # a single row longer than 256 bytes isn't one of ours
+    last = lines[-1].decode("utf-8", errors="replace")
+    offset = size - len(lines[-1]) - 1
+    date = last.split(",")[0]
+    if date == CSV_HEADER[0]:
+        return size, ""  # header only - append everything after it
+    return offset, date
+
+
+# Generator of row chunks [(date, score), ...] from day `since` (inclusive) to the end of the score database
+def iter_chunks(scores, since="", chunk_size=CHUNK_SIZE):
+    yield from scores.iter_days(since, chunk_size)
+
+
+class ScoreExporter:
+    # progress(done, total) and done(message) are called on the Tk thread through root.after
+    def __init__(self, root, scores, csv_path=CSV_FILE, parquet_path=None, chunk_size=CHUNK_SIZE,
+                 on_progress=None, on_done=None):
+        self.root = root
+        self.scores = scores
+        self.csv_path = csv_path
+        self.parquet_path = parquet_path
+        self.chunk_size = chunk_size
+        self.on_progress = on_progress
+        self.on_done = on_done
+        self._events = queue.Queue()
+        self._thread = None
+
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    # Kick off the export on a worker thread and start polling it from the Tk loop
+    def start(self, incremental=True):
+        if self.running():
+            return False
+        self._thread = threading.Thread(target=self._run, args=(incremental,), name="score-export", daemon=True)
+        self._thread.start()
+        if self.root is not None:
+            self.root.after(50, self._poll)
+        return True
+
+    # Run the export right here - used by the command line
+    def run(self, incremental=True):
+        self._run(incremental)
+        while not self._events.empty():
+            self._handle(self._events.get())
+
+    def _poll(self):
+        while True:
+            try:
+                event = self._events.get_nowait()
+            except queue.Empty:
+                break
+            self._handle(event)
+            if event[0] == "done":
+                return
+        self.root.after(50, self._poll)
+
+    def _handle(self, event):
+        if event[0] == "progress" and self.on_progress:
+            self.on_progress(event[1], event[2])
+        elif event[0] == "done" and self.on_done:
+            self.on_done(event[1])
+
+    def _run(self, incremental):
+        try:
+            message = self._export_csv(incremental)
+            if self.parquet_path:
+                message += "\n" + self._export_parquet()
+        except Exception as error:  # report anything to the UI instead of dying quietly in the thread
+            message = f"Export failed: {error}"
+        finally:
+            self.scores.release()  # every export runs on a new thread - don't leave its connection open
+        self._events.put(("done", message))
+
+    # Write (or append to) the CSV file chunk by chunk
+    def _export_csv(self, incremental):
+        last = _last_row(self.csv_path) if incremental else None
+        if last is None:
+            since = ""
+            f = open(self.csv_path, "w", newline="")
+            writer = csv.writer(f, lineterminator="\n")
+            writer.writerow(CSV_HEADER)
+        else:
+            offset, last_date = last
+            # Start from the last exported day again so an improved score for that day gets picked up
+            since = last_date
+            with open(self.csv_path, "r+b") as raw:
+                raw.truncate(offset)
+            f = open(self.csv_path, "a", newline="")
+            writer = csv.writer(f, lineterminator="\n")
+
+        total = self.scores.day_count() - self.scores.day_count_before(since)
+        written = 0
+        with f:
+            for chunk in iter_chunks(self.scores, since, self.chunk_size):
+                writer.writerows(chunk)
+                written += len(chunk)
+                self._events.put(("progress", written, total))
+            f.flush()
+            os.fsync(f.fileno())
+
+        absolute_path = os.path.abspath(self.csv_path)
+        # Print the absolute path so the user knows where the file is saved
+        print(f"Exported scores to: {absolute_path}")
+        return f"Exported {written} day(s) to {os.path.basename(self.csv_path)}!\nLocation: {absolute_path}"
+
+    # Full Parquet export, one row group per chunk so only one chunk is ever in memory
+    def _export_parquet(self):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            return "Parquet export skipped - pip install pyarrow to enable it"
+
+        schema = pa.schema([("date", pa.string()), ("score", pa.int32())])
+        tmp_path = self.parquet_path + ".tmp"
+        total = self.scores.day_count()
+        written = 0
+        with pq.ParquetWriter(tmp_path, schema) as writer:
+            for chunk in iter_chunks(self.scores, "", self.chunk_size):
+                dates, values = zip(*chunk)
+                writer.write_table(pa.table({"date": list(dates), "score": list(values)}, schema=schema))
+                written += len(chunk)
+                self._events.put(("progress", written, total))
+        os.replace(tmp_path, self.parquet_path)
+        return f"Wrote {written} day(s) to {os.path.abspath(self.parquet_path)}"
+
+
+def main(argv=None):
+    from score_db import ScoreDB
+
+    parser = argparse.ArgumentParser(description="Export Pi Memory Game scores")
+    parser.add_argument("--csv", default=CSV_FILE, help="CSV file to write (default: scores_export.csv)")
+    parser.add_argument("--parquet", help="also write a Parquet file (needs pyarrow)")
+    parser.add_argument("--full", action="store_true", help="rewrite the CSV instead of appending new days")
+    args = parser.parse_args(argv)
+
+    scores = ScoreDB()
+    try:
+        exporter = ScoreExporter(None, scores, args.csv, args.parquet, on_done=print)
+        exporter.run(incremental=not args.full)
+    finally:
+        scores.close()
+
+
+if __name__ == "__main__":
+    main()
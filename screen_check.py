@@ -0,0 +1,105 @@
+# Screen switching leak check for the Pi Memory Game
+# Builds the game window, then shows every registered screen in turn over and over and fails if the number of
+# widgets or the process memory (RSS) keeps growing - screens are supposed to be built once and reused.
+# Like startup_check.py it skips itself when there's no display to open a window on.
+#
+# Usage:
+#   python screen_check.py                       # 1000 rounds through every screen
+#   python screen_check.py --rounds 5000 --rss-budget-kib 2048
+
+import argparse
+import os
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+WARMUP_ROUNDS = 5  # first few rounds build every screen and fill caches - growth is measured after these
+
+
+# Resident memory of this process in KiB - None where we can't tell (Windows without psutil)
+def rss_kib():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # Not the current RSS but the peak - that still only grows if something leaks
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+# Screens that can be shown here - the graph needs matplotlib, so it's left out when that isn't installed
+def screen_names(game):
+    names = list(game.screens.builders)
+    try:
+        import matplotlib  # noqa: F401
+    except ImportError:
+        names.remove("graph")
+    return names
+
+
+# Show every screen `rounds` times - returns (screens, widgets and RSS after warm-up, widgets and RSS at the end)
+def run(rounds):
+    import tkinter as tk
+
+    os.chdir(HERE)
+    import pi_game
+
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        return None
+    game = pi_game.PiGame(root, audio_backend="null")
+    names = screen_names(game)
+    try:
+        for round_number in range(WARMUP_ROUNDS + rounds):
+            if round_number == WARMUP_ROUNDS:
+                start = game.screens.widget_count(), rss_kib()
+            for name in names:
+                game.show_screen(name)
+                root.update()
+        game.create_main_menu()
+        root.update()
+        end = game.screens.widget_count(), rss_kib()
+    finally:
+        game.scores.close()
+        game.audio.close()
+        root.destroy()
+    return names, start, end
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check that switching screens doesn't leak widgets or memory")
+    parser.add_argument("--rounds", type=int, default=1000, help="times to go through every screen")
+    parser.add_argument("--rss-budget-kib", type=int, default=1024, help="how much RSS may grow after warm-up")
+    args = parser.parse_args(argv)
+
+    result = run(args.rounds)
+    if result is None:
+        print("screen switching: skipped (no display)")
+        return 0
+    names, (start_widgets, start_rss), (end_widgets, end_rss) = result
+    print(f"{args.rounds:,} rounds through {len(names)} screens ({', '.join(names)})")
+
+    failed = False
+    print(f"widgets: {start_widgets:,} -> {end_widgets:,}")
+    if end_widgets > start_widgets:
+        print("FAIL: widget count grew")
+        failed = True
+    if start_rss is None:
+        print("RSS: skipped (can't measure it here)")
+    else:
+        print(f"RSS: {start_rss:,} KiB -> {end_rss:,} KiB (budget +{args.rss_budget_kib:,} KiB)")
+        if end_rss - start_rss > args.rss_budget_kib:
+            print("FAIL: RSS grew")
+            failed = True
+
+    print("FAIL" if failed else "OK")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
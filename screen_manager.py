@@ -0,0 +1,65 @@
+# Screen manager for the Pi Memory Game
+# Each screen is built once into its own Frame and kept around - switching screens just hides the old frame
+# and shows the new one, then lets the screen refresh its dynamic bits (labels, scores, etc).
+# Screens whose layout depends on data can be registered as dynamic, those get destroyed when you leave them
+# so they're rebuilt fresh next time instead of piling up hidden widgets.
+
+import tkinter as tk
+
+
+class ScreenManager:
+    def __init__(self, root, bg):
+        self.root = root
+        self.bg = bg
+        self.builders = {}  # name -> (build, refresh, dynamic)
+        self.frames = {}  # name -> Frame for every screen that's currently built
+        self.current = None
+
+    # Register a screen - build(frame) creates its widgets, refresh() updates them each time it's shown
+    def register(self, name, build, refresh=None, dynamic=False):
+        self.builders[name] = (build, refresh, dynamic)
+
+    # Hide the current screen and show the named one, building it the first time
+    # The new screen is built before the old one is hidden, so if building fails the old screen stays up
+    def show(self, name):
+        build, refresh, dynamic = self.builders[name]
+        if dynamic and self.current == name:
+            self.teardown(name)  # showing a dynamic screen again rebuilds it
+        frame = self.frames.get(name)
+        if frame is None:
+            frame = tk.Frame(self.root, bg=self.bg)
+            try:
+                build(frame)
+            except BaseException:
+                frame.destroy()
+                raise
+            self.frames[name] = frame
+
+        if self.current is not None and self.current != name and self.current in self.frames:
+            self.frames[self.current].pack_forget()
+            if self.builders[self.current][2]:
+                self.teardown(self.current)
+        frame.pack(fill="both", expand=True)
+        self.current = name
+        if refresh:
+            refresh()
+        return frame
+
+    # Destroy a screen's widgets so it gets rebuilt the next time it's shown
+    def teardown(self, name):
+        frame = self.frames.pop(name, None)
+        if frame is not None:
+            frame.destroy()
+        if self.current == name:
+            self.current = None
+
+    # Total number of widgets under the root - handy for checking nothing leaks
+    def widget_count(self):
+        count = 0
+        pending = [self.root]
+        while pending:
+            widget = pending.pop()
+            children = widget.winfo_children()
+            count += len(children)
+            pending.extend(children)
+        return count
@@ -0,0 +1,94 @@
+# Startup budget check for the Pi Memory Game
+# Imports pi_game in a fresh interpreter with "python -X importtime" and fails if the import takes longer than
+# the budget or if a heavy optional module (matplotlib, pandas, winsound) sneaks back into the startup path.
+# If a display is available it also times how long it takes to get the main menu on screen.
+#
+# Usage:
+#   python startup_check.py                      # default budgets
+#   python startup_check.py --import-budget-ms 150 --menu-budget-ms 500
+
+import argparse
+import os
+import subprocess
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+HEAVY_MODULES = ("matplotlib", "pandas", "numpy", "winsound")
+
+# Small script run in a separate process - builds the window, draws the menu once, then quits
+MENU_SCRIPT = """
+import time
+start = time.perf_counter()
+import tkinter as tk
+import pi_game
+root = tk.Tk()
+game = pi_game.PiGame(root)
+root.update()
+print((time.perf_counter() - start) * 1000)
+game.scores.close()
+root.destroy()
+"""
+
+
+# Run "import pi_game" with -X importtime and return (total ms, list of every module imported)
+def measure_import():
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import pi_game"],
+                            cwd=HERE, capture_output=True, text=True, check=True)
+    total_us = 0
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = line.split("|")
+        try:
+            cumulative = int(parts[1].strip())
+        except ValueError:
+            continue  # header line
+        name = parts[2].strip()
+        modules.append(name)
+        if name == "pi_game":
+            total_us = cumulative
+    return total_us / 1000, modules
+
+
+# Time from a cold start to the menu being drawn - returns None if there's no display to draw on
+def measure_menu():
+    result = subprocess.run([sys.executable, "-c", MENU_SCRIPT], cwd=HERE, capture_output=True, text=True)
+    if result.returncode != 0:
+        return None
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check the Pi Memory Game startup time budget")
+    parser.add_argument("--import-budget-ms", type=float, default=250, help="max time to import pi_game")
+    parser.add_argument("--menu-budget-ms", type=float, default=1000, help="max time to the first menu")
+    args = parser.parse_args(argv)
+
+    failed = False
+    import_ms, modules = measure_import()
+    print(f"import pi_game: {import_ms:.1f} ms (budget {args.import_budget_ms:.0f} ms)")
+    if import_ms > args.import_budget_ms:
+        print("FAIL: import is over budget")
+        failed = True
+
+    heavy = sorted({name for name in modules if name.split(".")[0] in HEAVY_MODULES})
+    if heavy:
+        print(f"FAIL: heavy modules loaded at startup: {', '.join(heavy)}")
+        failed = True
+
+    menu_ms = measure_menu()
+    if menu_ms is None:
+        print("time to first menu: skipped (no display)")
+    else:
+        print(f"time to first menu: {menu_ms:.1f} ms (budget {args.menu_budget_ms:.0f} ms)")
+        if menu_ms > args.menu_budget_ms:
+            print("FAIL: time to first menu is over budget")
+            failed = True
+
+    print("FAIL" if failed else "OK")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,160 @@
+# Recitation checker for the Pi Memory Game
+# Takes a whole block of digits in one go (a paste, a file or stdin) instead of one key at a time and compares
+# it against the digit store in a single vectorized pass - np.frombuffer on both sides, one != and one
+# flatnonzero - so a million digit transcript takes milliseconds. Without numpy it falls back to comparing
+# 4 KiB blocks with plain bytes equality and only looks closer at the blocks that differ.
+#
+# The transcript lines up digit for digit with pi (index 0 = the first digit after "3."). A leading "3." is
+# skipped, and so is a leading 3 written without the point ("31415..." or "3,1415...") when the digits after it
+# line up with pi better than the transcript does as it stands. Spaces, line breaks and other separators are ignored. The three strikes score is what a Real Game
+# would have given: the digits recited correctly before the third wrong one.
+#
+# Usage:
+#   python verify.py recitation.txt
+#   python verify.py - < recitation.txt
+#   python verify.py --bench                     # time a 1M digit transcript
+
+import argparse
+import random
+import string
+import sys
+import time
+from collections import namedtuple
+
+from digit_source import DigitSource, load_digit_source
+from engine import MAX_WRONG_GUESSES
+
+BLOCK = 4096  # bytes compared at a time by the plain Python fallback
+PROBE = 50  # digits compared both ways when deciding whether a transcript starts with pi's leading 3
+
+# checked        - digits compared (the transcript, cut to the end of the digit store)
+# first_mismatch - index of the first wrong digit, or None if they were all right
+# mismatches     - index of every wrong digit
+# score          - three strikes score (correct digits before the third wrong one)
+# extra          - transcript digits past the end of the digit store that couldn't be checked
+VerifyResult = namedtuple("VerifyResult", "checked first_mismatch mismatches score extra")
+
+_NOT_DIGITS = bytes(set(range(256)) - set(string.digits.encode("ascii")))
+
+
+# Turn a pasted or loaded transcript into plain ASCII digits - drops a leading "3." and every separator
+def clean_transcript(text):
+    if isinstance(text, str):
+        text = text.encode("ascii", errors="ignore")
+    text = text.lstrip()
+    if text.startswith(b"3."):
+        text = text[2:]
+    return text.translate(None, _NOT_DIGITS)
+
+
+# Does a cleaned transcript start with pi's leading 3 (written without the "3." we already strip)?
+# Only if the digits after the 3 line up with the store better than the transcript does as it is
+def _has_leading_three(digits, recited):
+    if not recited.startswith(b"3"):
+        return False
+    n = min(PROBE, len(recited) - 1, len(digits))
+    expected = digits.digits(0, n).encode("ascii")
+    as_is = sum(a != b for a, b in zip(expected, recited[:n]))
+    shifted = sum(a != b for a, b in zip(expected, recited[1:n + 1]))
+    return shifted < as_is
+
+
+# Indexes where two equal-length byte strings differ
+def _mismatches(expected, recited):
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+    if np is not None:
+        a = np.frombuffer(expected, dtype=np.uint8)
+        b = np.frombuffer(recited, dtype=np.uint8)
+        return np.flatnonzero(a != b).tolist()
+
+    found = []
+    for start in range(0, len(recited), BLOCK):
+        stop = start + BLOCK
+        if expected[start:stop] != recited[start:stop]:
+            found.extend(i for i in range(start, min(stop, len(recited))) if expected[i] != recited[i])
+    return found
+
+
+# Check a transcript against the digit store, starting `start` digits after the "3."
+def verify(digits, transcript, start=0):
+    recited = clean_transcript(transcript)
+    if start == 0 and _has_leading_three(digits, recited):
+        recited = recited[1:]
+    checked = max(0, min(len(recited), len(digits) - start))
+    expected = digits.digits(start, start + checked).encode("ascii")
+    mismatches = [start + i for i in _mismatches(expected, recited[:checked])]
+
+    # Every wrong digit is a strike - the score is how many right ones came before the last strike allowed
+    if len(mismatches) >= MAX_WRONG_GUESSES:
+        score = mismatches[MAX_WRONG_GUESSES - 1] - start - (MAX_WRONG_GUESSES - 1)
+    else:
+        score = checked - len(mismatches)
+    return VerifyResult(checked, mismatches[0] if mismatches else None, mismatches, score, len(recited) - checked)
+
+
+# A few lines describing the result, used by the command line and the verify screen
+def summary(result, digits, show=10):
+    if not result.checked:
+        return "No digits to check"
+    lines = [f"Checked {result.checked:,} digits - {len(result.mismatches):,} wrong"]
+    if result.first_mismatch is None:
+        lines.append("Perfect recitation!")
+    else:
+        lines.append(f"First mistake at digit {result.first_mismatch + 1:,} (pi has {digits.digit(result.first_mismatch)})")
+        more = f" and {len(result.mismatches) - show:,} more" if len(result.mismatches) > show else ""
+        lines.append("Wrong digits at: " + ", ".join(f"{i + 1:,}" for i in result.mismatches[:show]) + more)
+    lines.append(f"Three strikes score: {result.score:,}")
+    if result.extra:
+        lines.append(f"{result.extra:,} digits past the end of the digit store weren't checked")
+    return "\n".join(lines)
+
+
+# Time a 1M digit transcript with a sprinkling of mistakes against a 1M digit store
+def bench(size=1_000_000, error_rate=0.001, seed=314):
+    rng = random.Random(seed)
+    store = "".join(rng.choices(string.digits, k=size))
+    digits = DigitSource.from_string(store)
+    transcript = bytearray(store.encode("ascii"))
+    for i in rng.sample(range(size), int(size * error_rate)):
+        transcript[i] = ord(str((transcript[i] - 48 + 1) % 10))
+    transcript = bytes(transcript)
+
+    times = []
+    for _ in range(5):
+        started = time.perf_counter()
+        result = verify(digits, transcript)
+        times.append(time.perf_counter() - started)
+    print(f"{size:,} digits, {len(result.mismatches):,} wrong: best {min(times) * 1000:.1f} ms, "
+          f"worst {max(times) * 1000:.1f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check a pi recitation against the digit store")
+    parser.add_argument("transcript", nargs="?", help="file with the recited digits (- for stdin)")
+    parser.add_argument("--start", type=int, default=0, help="digit the recitation starts at (default: 0, right after 3.)")
+    parser.add_argument("--all", action="store_true", help="list every wrong digit")
+    parser.add_argument("--bench", action="store_true", help="time a 1M digit transcript")
+    args = parser.parse_args(argv)
+
+    if args.bench:
+        bench()
+        return 0
+    if not args.transcript:
+        parser.error("give a transcript file, - for stdin, or --bench")
+    if args.transcript == "-":
+        transcript = sys.stdin.buffer.read()
+    else:
+        with open(args.transcript, "rb") as f:
+            transcript = f.read()
+
+    digits = load_digit_source()
+    result = verify(digits, transcript, args.start)
+    print(summary(result, digits, show=len(result.mismatches) if args.all else 10))
+    return 0 if result.checked and result.first_mismatch is None else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
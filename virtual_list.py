@@ -0,0 +1,99 @@
+# Virtualized list for the Pi Memory Game progress screen
+# Draws only the rows that fit in the window on a Canvas and reuses the same handful of canvas items as you
+# scroll, so showing 10 days or 10,000 days of scores costs the same. The list never holds the data itself -
+# it just asks get_text(index) for whatever rows are on screen.
+
+import tkinter as tk
+
+
+class VirtualList:
+    def __init__(self, parent, get_text, row_height=34, visible_rows=8, width=300, bg="#E6F0FA",
+                 row_bg="lightpink", font=("Arial", 12), on_click=None):
+        self.get_text = get_text
+        self.on_click = on_click  # called with the row index when a row is clicked
+        self.row_height = row_height
+        self.visible_rows = visible_rows
+        self.width = width
+        self.count = 0
+        self.top = 0.0  # scroll offset in pixels
+
+        self.frame = tk.Frame(parent, bg=bg)
+        self.canvas = tk.Canvas(self.frame, width=width, height=row_height * visible_rows, bg=bg, highlightthickness=0)
+        self.scrollbar = tk.Scrollbar(self.frame, orient="vertical", command=self.yview)
+        self.canvas.pack(side="left")
+        self.scrollbar.pack(side="right", fill="y")
+
+        # One rectangle + text pair per row that can be on screen at once (+1 for the row sliding in)
+        self.pool = []
+        for _ in range(visible_rows + 1):
+            rect = self.canvas.create_rectangle(0, 0, 0, 0, fill=row_bg, outline="#C08090")
+            text = self.canvas.create_text(0, 0, text="", font=font)
+            self.pool.append((rect, text))
+
+        # Mouse wheel scrolling (Windows/macOS send <MouseWheel>, X11 sends Button-4/5)
+        self.canvas.bind("<MouseWheel>", lambda e: self.scroll_rows(-1 if e.delta > 0 else 1))
+        self.canvas.bind("<Button-4>", lambda e: self.scroll_rows(-1))
+        self.canvas.bind("<Button-5>", lambda e: self.scroll_rows(1))
+        self.canvas.bind("<Button-1>", self.click)
+
+    def pack(self, **kwargs):
+        self.frame.pack(**kwargs)
+
+    def pack_forget(self):
+        self.frame.pack_forget()
+
+    # Change how many rows there are and jump back to the top
+    def set_count(self, count):
+        self.count = count
+        self.top = 0.0
+        self.redraw()
+
+    def _max_top(self):
+        return max(0.0, self.count * self.row_height - self.visible_rows * self.row_height)
+
+    # Scrollbar callback - handles both dragging ("moveto") and the arrows/trough ("scroll")
+    def yview(self, *args):
+        if not args:
+            return
+        if args[0] == "moveto":
+            self.top = float(args[1]) * self.count * self.row_height
+        elif args[0] == "scroll":
+            amount = int(args[1])
+            step = self.visible_rows if args[2] == "pages" else 1
+            self.top += amount * step * self.row_height
+        self.redraw()
+
+    def scroll_rows(self, rows):
+        self.top += rows * self.row_height
+        self.redraw()
+
+    # Work out which row was clicked and pass it on
+    def click(self, event):
+        index = int((self.top + event.y) // self.row_height)
+        if self.on_click is not None and 0 <= index < self.count:
+            self.on_click(index)
+
+    # Move the pooled items to the rows that are currently visible and fill in their text
+    def redraw(self):
+        self.top = min(max(self.top, 0.0), self._max_top())
+        first = int(self.top // self.row_height)
+        offset = self.top - first * self.row_height
+        pad = 3
+        for slot, (rect, text) in enumerate(self.pool):
+            index = first + slot
+            if index >= self.count:
+                self.canvas.itemconfigure(rect, state="hidden")
+                self.canvas.itemconfigure(text, state="hidden")
+                continue
+            y = slot * self.row_height - offset
+            self.canvas.coords(rect, pad, y + pad, self.width - pad, y + self.row_height - pad)
+            self.canvas.coords(text, self.width / 2, y + self.row_height / 2)
+            self.canvas.itemconfigure(rect, state="normal")
+            self.canvas.itemconfigure(text, state="normal", text=self.get_text(index))
+
+        # Keep the scrollbar thumb in sync
+        total = self.count * self.row_height
+        if total <= 0:
+            self.scrollbar.set(0.0, 1.0)
+        else:
+            self.scrollbar.set(self.top / total, min(1.0, (self.top + self.visible_rows * self.row_height) / total))